@@ -1,5 +1,6 @@
 """Generate NSIS installer images with void aesthetic."""
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import os
 
 # Void color palette
@@ -13,15 +14,42 @@ CRT_WHITE = (240, 240, 240)
 BUILD_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGO_PATH = os.path.join(os.path.dirname(BUILD_DIR), "audiobash-logo.png")
 
+# TrueType fonts loaded so far, keyed by point size
+_FONT_CACHE = {}
+
+def load_font(size):
+    """Load the monospace UI font once per size, falling back to PIL's default."""
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        try:
+            font = ImageFont.truetype("consola.ttf", size)
+        except OSError:
+            font = ImageFont.load_default()
+        _FONT_CACHE[size] = font
+    return font
+
+def vertical_gradient(width, height, spread, scanline_step=0):
+    """Build a grey top-to-bottom gradient as an RGB image.
+
+    Every ``scanline_step``-th row is blacked out for a CRT scan line effect.
+    Rows are computed once and broadcast across the width as a single-channel
+    image, then expanded to RGB in one convert.
+    """
+    intensity = (5 + np.arange(height) / height * spread).astype(np.uint8)
+    if scanline_step:
+        intensity[::scanline_step] = 0
+    gray = np.ascontiguousarray(np.broadcast_to(intensity[:, None], (height, width)))
+    return Image.fromarray(gray, 'L').convert('RGB')
+
 def create_header_image():
     """Create 150x57 header image for installer pages."""
-    img = Image.new('RGB', (150, 57), VOID)
-    draw = ImageDraw.Draw(img)
-
     # Add subtle gradient effect
-    for y in range(57):
-        intensity = int(5 + (y / 57) * 10)
-        draw.line([(0, y), (150, y)], fill=(intensity, intensity, intensity))
+    img = vertical_gradient(150, 57, 10)
+
+    # Add accent line at bottom
+    img.paste(ACCENT, (0, 55, 150, 57))
+
+    draw = ImageDraw.Draw(img)
 
     # Load and resize logo
     try:
@@ -39,17 +67,9 @@ def create_header_image():
         print(f"Could not load logo: {e}")
 
     # Add "AUDIOBASH" text
-    try:
-        # Try to use a monospace font
-        font = ImageFont.truetype("consola.ttf", 14)
-    except:
-        font = ImageFont.load_default()
-
+    font = load_font(14)
     draw.text((58, 20), "AUDIOBASH", fill=CRT_WHITE, font=font)
 
-    # Add accent line at bottom
-    draw.line([(0, 55), (150, 55)], fill=ACCENT, width=2)
-
     # Save as BMP
     output_path = os.path.join(BUILD_DIR, "installerHeader.bmp")
     img.save(output_path, "BMP")
@@ -57,18 +77,13 @@ def create_header_image():
 
 def create_sidebar_image():
     """Create 164x314 sidebar image for welcome/finish pages."""
-    img = Image.new('RGB', (164, 314), VOID)
-    draw = ImageDraw.Draw(img)
+    # Create gradient background with scan line effect
+    img = vertical_gradient(164, 314, 15, scanline_step=3)
 
-    # Create gradient background
-    for y in range(314):
-        # Subtle vertical gradient
-        intensity = int(5 + (y / 314) * 15)
-        draw.line([(0, y), (164, y)], fill=(intensity, intensity, intensity))
+    # Add vertical accent line on right edge
+    img.paste(ACCENT, (162, 0, 164, 314))
 
-    # Add scan line effect
-    for y in range(0, 314, 3):
-        draw.line([(0, y), (164, y)], fill=(0, 0, 0))
+    draw = ImageDraw.Draw(img)
 
     # Load and position logo
     try:
@@ -85,23 +100,15 @@ def create_sidebar_image():
     except Exception as e:
         print(f"Could not load logo: {e}")
 
-    # Add vertical accent line on right edge
-    draw.line([(162, 0), (162, 314)], fill=ACCENT, width=2)
-
     # Add "VOICE TERMINAL" text vertically at bottom
-    try:
-        font = ImageFont.truetype("consola.ttf", 11)
-    except:
-        font = ImageFont.load_default()
-
-    # Draw text
-    text_y = 180
-    for i, char in enumerate("VOICE"):
-        draw.text((72, text_y + i * 14), char, fill=ACCENT, font=font)
-
-    text_y = 260
-    for i, char in enumerate("TERM"):
-        draw.text((72, text_y + i * 14), char, fill=CRT_WHITE, font=font)
+    font = load_font(11)
+
+    # Draw each word as one stacked multiline render (14px letter pitch)
+    letter_spacing = 14 - draw.textbbox((0, 0), "A", font=font)[3]
+    draw.multiline_text((72, 180), "\n".join("VOICE"), fill=ACCENT, font=font,
+                        spacing=letter_spacing)
+    draw.multiline_text((72, 260), "\n".join("TERM"), fill=CRT_WHITE, font=font,
+                        spacing=letter_spacing)
 
     # Save as BMP
     output_path = os.path.join(BUILD_DIR, "installerSidebar.bmp")
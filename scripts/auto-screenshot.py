@@ -10,7 +10,12 @@ import sys
 from pathlib import Path
 
 import pyautogui
-from PIL import Image
+from PIL import Image, ImageChops
+
+try:
+    import dxcam  # Optional: DXGI Desktop Duplication capture
+except ImportError:
+    dxcam = None
 
 # Paths
 SCRIPT_DIR = Path(__file__).parent
@@ -18,38 +23,120 @@ PROJECT_DIR = SCRIPT_DIR.parent
 SCREENSHOTS_DIR = PROJECT_DIR / "docs" / "screenshots"
 SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Resampling filter for the 800px web previews. BICUBIC is visually
+# indistinguishable from LANCZOS at these ~2x UI downscales with a smaller
+# kernel; use LANCZOS only for print-quality output.
+WEB_RESAMPLE = Image.Resampling.BICUBIC
+
 # Disable pyautogui failsafe for automation
 pyautogui.FAILSAFE = False
 
 # Windows API
 user32 = ctypes.windll.user32
+gdi32 = ctypes.windll.gdi32
+kernel32 = ctypes.windll.kernel32
+
+HDC = ctypes.wintypes.HDC
+HBITMAP = ctypes.wintypes.HBITMAP
+user32.GetWindowDC.restype = HDC
+user32.GetWindowDC.argtypes = [ctypes.wintypes.HWND]
+user32.ReleaseDC.argtypes = [ctypes.wintypes.HWND, HDC]
+user32.PrintWindow.argtypes = [ctypes.wintypes.HWND, HDC, ctypes.c_uint]
+gdi32.CreateCompatibleDC.restype = HDC
+gdi32.CreateCompatibleDC.argtypes = [HDC]
+gdi32.CreateCompatibleBitmap.restype = HBITMAP
+gdi32.CreateCompatibleBitmap.argtypes = [HDC, ctypes.c_int, ctypes.c_int]
+gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+gdi32.SelectObject.argtypes = [HDC, ctypes.wintypes.HGDIOBJ]
+gdi32.GetDIBits.argtypes = [HDC, HBITMAP, ctypes.c_uint, ctypes.c_uint,
+                            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint]
+gdi32.DeleteObject.argtypes = [ctypes.wintypes.HGDIOBJ]
+gdi32.DeleteDC.argtypes = [HDC]
+kernel32.OpenProcess.restype = ctypes.wintypes.HANDLE
+kernel32.OpenProcess.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.BOOL, ctypes.wintypes.DWORD]
+kernel32.QueryFullProcessImageNameW.argtypes = [ctypes.wintypes.HANDLE, ctypes.wintypes.DWORD,
+                                                ctypes.wintypes.LPWSTR, ctypes.POINTER(ctypes.wintypes.DWORD)]
+kernel32.CloseHandle.argtypes = [ctypes.wintypes.HANDLE]
+
+PW_RENDERFULLCONTENT = 0x00000002  # Windows 8.1+, renders DirectComposition content
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+# Executables that host the AudioBash window (dev mode / packaged build)
+ELECTRON_PROCESSES = {"electron.exe", "audiobash.exe"}
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.wintypes.DWORD),
+        ("biWidth", ctypes.wintypes.LONG),
+        ("biHeight", ctypes.wintypes.LONG),
+        ("biPlanes", ctypes.wintypes.WORD),
+        ("biBitCount", ctypes.wintypes.WORD),
+        ("biCompression", ctypes.wintypes.DWORD),
+        ("biSizeImage", ctypes.wintypes.DWORD),
+        ("biXPelsPerMeter", ctypes.wintypes.LONG),
+        ("biYPelsPerMeter", ctypes.wintypes.LONG),
+        ("biClrUsed", ctypes.wintypes.DWORD),
+        ("biClrImportant", ctypes.wintypes.DWORD),
+    ]
+
+# Offscreen (width, height, DC, bitmap) and pixel buffer, reused across
+# captures while the window size is unchanged
+_render_target = None
+_capture_buffer = None
+
+# DXGI duplication session used when PrintWindow fails (None = no fallback)
+_camera = None
+# Last (region, frame) from DXGI - dxcam returns None when nothing has changed
+_last_frame = None
 
 # Callback type for EnumWindows
 EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
 
-# Store found windows globally (ctypes callback limitation)
-_found_windows = []
-
-def _enum_callback(hwnd, lParam):
-    """Callback for EnumWindows."""
-    if user32.IsWindowVisible(hwnd):
-        length = user32.GetWindowTextLengthW(hwnd)
-        if length > 0:
-            buffer = ctypes.create_unicode_buffer(length + 1)
-            user32.GetWindowTextW(hwnd, buffer, length + 1)
-            _found_windows.append((hwnd, buffer.value))
-    return True
-
-def find_window_by_title(title_part: str):
-    """Find window handle by partial title match."""
-    global _found_windows
-    _found_windows = []
-
-    # Enumerate all windows
-    user32.EnumWindows(EnumWindowsProc(_enum_callback), 0)
+def get_process_name(pid):
+    """Get the lowercase executable name for a process ID ("" if inaccessible)."""
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        return ""
+    try:
+        size = ctypes.wintypes.DWORD(260)
+        buffer = ctypes.create_unicode_buffer(size.value)
+        if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+            return ""
+        return Path(buffer.value).name.lower()
+    finally:
+        kernel32.CloseHandle(handle)
+
+def find_window_by_title(title_part: str, process_names=None):
+    """Find visible windows by partial title match (all windows if empty).
+
+    If process_names is given, windows owned by other executables are skipped
+    before their titles are read.
+    """
+    needle = title_part.lower()
+    matches = []
+    names_by_pid = {}
+
+    def _enum_callback(hwnd, lParam):
+        """Callback for EnumWindows - filters while enumerating."""
+        if user32.IsWindowVisible(hwnd):
+            if process_names:
+                pid = ctypes.wintypes.DWORD()
+                user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+                if pid.value not in names_by_pid:
+                    names_by_pid[pid.value] = get_process_name(pid.value)
+                if names_by_pid[pid.value] not in process_names:
+                    return True
+            length = user32.GetWindowTextLengthW(hwnd)
+            if length > 0:
+                buffer = ctypes.create_unicode_buffer(length + 1)
+                user32.GetWindowTextW(hwnd, buffer, length + 1)
+                if needle in buffer.value.lower():
+                    matches.append((hwnd, buffer.value))
+        return True
 
-    # Filter by title
-    matches = [(h, t) for h, t in _found_windows if title_part.lower() in t.lower()]
+    user32.EnumWindows(EnumWindowsProc(_enum_callback), 0)
     return matches
 
 def get_window_rect(hwnd):
@@ -58,6 +145,129 @@ def get_window_rect(hwnd):
     user32.GetWindowRect(hwnd, ctypes.byref(rect))
     return rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top
 
+def grab_screen_region(hwnd, width, height):
+    """Grab the window's on-screen pixels from the DXGI duplication session.
+
+    Returns None if the region can't be grabbed (e.g. not on the primary
+    display), so the caller can report the failed PrintWindow instead.
+    """
+    global _last_frame
+    left, top, _, _ = get_window_rect(hwnd)
+    region = (left, top, left + width, top + height)
+    try:
+        frame = _camera.grab(region=region)
+    except ValueError:
+        return None
+
+    if frame is None:
+        # Screen unchanged since the last grab
+        if _last_frame is None or _last_frame[0] != region:
+            return None
+        frame = _last_frame[1]
+    _last_frame = (region, frame)
+    return Image.fromarray(frame)
+
+def grab_window(hwnd, width, height):
+    """Capture a window with PrintWindow, falling back to DXGI if it fails.
+
+    The DXGI grab copies whatever is on screen in the window rect, so it's
+    only used when the window can't render itself offscreen.
+    """
+    try:
+        return print_window(hwnd, width, height)
+    except OSError:
+        if _camera is None:
+            raise
+        image = grab_screen_region(hwnd, width, height)
+        if image is None:
+            raise
+        return image
+
+def get_render_target(hwnd, width, height):
+    """Get the offscreen DC, bitmap and pixel buffer for a capture size.
+
+    All three are created once and reused for every capture (including the
+    settle polls) until the window size changes.
+    """
+    global _render_target, _capture_buffer
+    if _render_target is not None and _render_target[:2] == (width, height):
+        return _render_target[2], _render_target[3]
+
+    release_render_target()
+    window_dc = user32.GetWindowDC(hwnd)
+    try:
+        mem_dc = gdi32.CreateCompatibleDC(window_dc)
+        bitmap = gdi32.CreateCompatibleBitmap(window_dc, width, height)
+    finally:
+        user32.ReleaseDC(hwnd, window_dc)
+    gdi32.SelectObject(mem_dc, bitmap)
+
+    _render_target = (width, height, mem_dc, bitmap)
+    _capture_buffer = (ctypes.c_uint8 * (width * height * 4))()
+    return mem_dc, bitmap
+
+def release_render_target():
+    """Free the cached offscreen DC and bitmap."""
+    global _render_target
+    if _render_target is not None:
+        _, _, mem_dc, bitmap = _render_target
+        gdi32.DeleteDC(mem_dc)
+        gdi32.DeleteObject(bitmap)
+        _render_target = None
+
+def print_window(hwnd, width, height):
+    """Render a window into the reused BGRX buffer with PrintWindow/GetDIBits.
+
+    The window draws itself into an offscreen bitmap, so it doesn't need to
+    be in the foreground or unobscured, and the desktop is never grabbed.
+    """
+    mem_dc, bitmap = get_render_target(hwnd, width, height)
+
+    header = BITMAPINFOHEADER()
+    header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+    header.biWidth = width
+    header.biHeight = -height  # Negative height = top-down rows
+    header.biPlanes = 1
+    header.biBitCount = 32
+    header.biCompression = BI_RGB
+
+    if not user32.PrintWindow(hwnd, mem_dc, PW_RENDERFULLCONTENT):
+        raise OSError("PrintWindow failed")
+    gdi32.GetDIBits(mem_dc, bitmap, 0, height, _capture_buffer,
+                    ctypes.byref(header), DIB_RGB_COLORS)
+
+    # Decoding BGRX -> RGB gives the caller its own copy, so the buffer
+    # can be safely overwritten by the next capture
+    return Image.frombuffer('RGB', (width, height), _capture_buffer, 'raw', 'BGRX', 0, 1)
+
+def wait_settled(hwnd, timeout=0.8, interval=0.03, stable_polls=3):
+    """Wait until the window's contents stop changing, capped at timeout.
+
+    Replaces fixed sleeps after UI actions: returns as soon as the window
+    renders the same frame for stable_polls consecutive polls. The last
+    frame is returned so a capture can reuse it, or None if the window
+    couldn't be grabbed - then it just waits out the timeout.
+    """
+    _, _, width, height = get_window_rect(hwnd)
+    deadline = time.monotonic() + timeout
+    try:
+        frame = grab_window(hwnd, width, height)
+        stable = 0
+        while stable < stable_polls and time.monotonic() < deadline:
+            time.sleep(interval)
+            next_frame = grab_window(hwnd, width, height)
+            if ImageChops.difference(frame, next_frame).getbbox() is None:
+                stable += 1
+            else:
+                stable = 0
+            frame = next_frame
+    except OSError:
+        # PrintWindow fails on minimized/occluded windows - fall back to
+        # the fixed wait rather than aborting the run
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        return None
+    return frame
+
 def bring_to_front(hwnd):
     """Bring window to front."""
     # Show window if minimized
@@ -68,36 +278,31 @@ def bring_to_front(hwnd):
 def capture_window_by_hwnd(hwnd, name: str, description: str = ""):
     """Capture a window screenshot by handle."""
     try:
-        # Bring to front
-        bring_to_front(hwnd)
-        time.sleep(0.3)
-
-        # Get window bounds
-        left, top, width, height = get_window_rect(hwnd)
-
-        # Ensure positive values and valid size
-        left = max(0, left)
-        top = max(0, top)
+        # Get window size - PrintWindow doesn't need the window in front
+        _, _, width, height = get_window_rect(hwnd)
 
         if width <= 0 or height <= 0:
             print(f"[ERROR] {name}: Invalid window size {width}x{height}")
             return False
 
-        # Capture
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        # Capture once the UI has finished updating
+        screenshot = wait_settled(hwnd)
+        if screenshot is None:
+            # One more try; a failure here is reported for this shot only
+            screenshot = grab_window(hwnd, width, height)
 
-        # Save full size
+        # Save full size - screenshots barely shrink under heavier zlib
+        # effort, so favour encode speed over a few percent of file size
         output_path = SCREENSHOTS_DIR / f"{name}.png"
-        screenshot.save(output_path, optimize=True)
+        screenshot.save(output_path, "PNG", compress_level=1)
 
-        # Create web-optimized version (max 800px width)
-        web_path = SCREENSHOTS_DIR / f"{name}-web.png"
-        web_img = screenshot.copy()
-        if web_img.width > 800:
-            ratio = 800 / web_img.width
-            new_size = (800, int(web_img.height * ratio))
-            web_img = web_img.resize(new_size, Image.Resampling.LANCZOS)
-        web_img.save(web_path, optimize=True)
+        # Create web-optimized version (max 800px width). JPEG encodes
+        # several times faster than optimized PNG and lossless output isn't
+        # needed for docs previews. The full-size image is already on disk,
+        # so downscale in place rather than copying the frame (no-op <= 800px)
+        web_path = SCREENSHOTS_DIR / f"{name}-web.jpg"
+        screenshot.thumbnail((800, screenshot.height), WEB_RESAMPLE)
+        screenshot.save(web_path, "JPEG", quality=85)
 
         print(f"[OK] {name}: {description}")
         print(f"     Full: {output_path.name} ({output_path.stat().st_size // 1024}KB)")
@@ -110,26 +315,26 @@ def capture_window_by_hwnd(hwnd, name: str, description: str = ""):
         traceback.print_exc()
         return False
 
-def send_hotkey(*keys, delay=0.3):
-    """Send a hotkey combination."""
-    time.sleep(delay)
+def send_hotkey(hwnd, *keys):
+    """Send a hotkey combination and wait for the window to settle."""
     pyautogui.hotkey(*keys)
-    time.sleep(0.5)
+    wait_settled(hwnd)
 
-def click_at(x, y, delay=0.3):
+def click_at(x, y):
     """Click at absolute position."""
-    time.sleep(delay)
     pyautogui.click(x, y)
-    time.sleep(0.3)
 
-def click_window_relative(hwnd, x_ratio, y_ratio, delay=0.3):
-    """Click at a position relative to window (0-1 ratios)."""
-    left, top, width, height = get_window_rect(hwnd)
+def click_window_relative(hwnd, rect, x_ratio, y_ratio):
+    """Click at a position relative to the window rect (0-1 ratios) and wait for it to settle."""
+    left, top, width, height = rect
     x = left + int(width * x_ratio)
     y = top + int(height * y_ratio)
-    click_at(x, y, delay)
+    click_at(x, y)
+    wait_settled(hwnd)
 
 def main():
+    global _camera
+
     print("=" * 60)
     print("AudioBash Automated Screenshot Capture")
     print("=" * 60)
@@ -138,13 +343,13 @@ def main():
     # Find AudioBash window - look for electron app, not browser tabs
     print("Looking for AudioBash window...")
 
-    # Get all windows and filter
-    find_window_by_title("")  # Populate _found_windows
+    # Only read titles of windows owned by Electron processes
+    electron_windows = find_window_by_title("", ELECTRON_PROCESSES)
 
     # Look for the Electron app window (not browser pages about AudioBash)
     # The actual app window title is usually just "audiobash" in dev mode
     windows = []
-    for hwnd, title in _found_windows:
+    for hwnd, title in electron_windows:
         title_lower = title.lower()
         # Skip browser windows
         if "edge" in title_lower or "chrome" in title_lower or "firefox" in title_lower:
@@ -160,13 +365,14 @@ def main():
         print("ERROR: AudioBash window not found!")
         print("Make sure AudioBash is running (npm run electron:dev)")
         print("\nAvailable windows:")
-        find_window_by_title("")
-        for hwnd, title in _found_windows[:20]:
+        for hwnd, title in find_window_by_title("")[:20]:
             print(f"  - {title[:60]}")
         sys.exit(1)
 
     hwnd, title = windows[0]
-    left, top, width, height = get_window_rect(hwnd)
+    # The script never moves or resizes the window, so the rect is read once
+    window_rect = get_window_rect(hwnd)
+    left, top, width, height = window_rect
     # Clean title for printing (remove non-ASCII chars)
     clean_title = title.encode('ascii', 'ignore').decode('ascii')
     print(f"Found window: {clean_title}")
@@ -179,67 +385,71 @@ def main():
     print("Capturing screenshots...")
     print("-" * 40)
 
+    # Captures don't need focus, but the clicks and hotkeys below do
+    bring_to_front(hwnd)
+
+    # Allocate the capture buffers once for the whole run
+    get_render_target(hwnd, width, height)
+
+    # One DXGI duplication session for the whole run when dxcam is installed,
+    # as the fallback for windows PrintWindow can't render
+    if dxcam is not None:
+        _camera = dxcam.create(output_color="RGB")
+
     # 1. Main window - default state
     capture_window_by_hwnd(hwnd, "01-main-window", "Main terminal window")
 
     # 2. Try opening settings (gear icon is typically top-right)
     print("\nOpening settings panel...")
-    click_window_relative(hwnd, 0.97, 0.04)  # Top-right corner for gear icon
-    time.sleep(0.8)
+    click_window_relative(hwnd, window_rect, 0.97, 0.04)  # Top-right corner for gear icon
     capture_window_by_hwnd(hwnd, "02-settings-panel", "Settings panel open")
 
     # Close settings by pressing Escape
-    send_hotkey('escape')
-    time.sleep(0.3)
+    send_hotkey(hwnd, 'escape')
 
     # 3. Voice recording - press Alt+S
     print("\nTriggering voice recording (Alt+S)...")
     bring_to_front(hwnd)
-    send_hotkey('alt', 's')
-    time.sleep(0.5)
+    send_hotkey(hwnd, 'alt', 's')
     capture_window_by_hwnd(hwnd, "03-voice-recording", "Voice recording active")
 
     # Stop recording
-    send_hotkey('alt', 's')
-    time.sleep(0.5)
+    send_hotkey(hwnd, 'alt', 's')
 
     # 4. Create a new tab for split view
     print("\nCreating new tab (Ctrl+T)...")
     bring_to_front(hwnd)
-    send_hotkey('ctrl', 't')
-    time.sleep(0.5)
+    send_hotkey(hwnd, 'ctrl', 't')
 
     # 5. Cycle to split layout (Alt+L)
     print("\nSwitching to split layout (Alt+L)...")
-    send_hotkey('alt', 'l')
-    time.sleep(0.5)
+    send_hotkey(hwnd, 'alt', 'l')
     capture_window_by_hwnd(hwnd, "04-split-view-horizontal", "Horizontal split view")
 
     # Try another layout
-    send_hotkey('alt', 'l')
-    time.sleep(0.5)
+    send_hotkey(hwnd, 'alt', 'l')
     capture_window_by_hwnd(hwnd, "05-split-view-vertical", "Vertical split view")
 
     # 6. Quick navigation - look for folder icon
     print("\nOpening quick navigation...")
-    click_window_relative(hwnd, 0.03, 0.96)  # Bottom-left for folder icon
-    time.sleep(0.5)
+    click_window_relative(hwnd, window_rect, 0.03, 0.96)  # Bottom-left for folder icon
     capture_window_by_hwnd(hwnd, "06-quick-nav", "Quick navigation panel")
 
     # Close nav
-    send_hotkey('escape')
-    time.sleep(0.3)
+    send_hotkey(hwnd, 'escape')
 
     # 7. Back to single view
     print("\nReturning to single layout...")
     for _ in range(4):
-        send_hotkey('alt', 'l')
-        time.sleep(0.2)
+        send_hotkey(hwnd, 'alt', 'l')
 
     # 8. Clean terminal state
-    time.sleep(0.3)
     capture_window_by_hwnd(hwnd, "07-terminal-clean", "Clean terminal view")
 
+    if _camera is not None:
+        _camera.release()
+    release_render_target()
+
     print()
     print("=" * 60)
     print("Screenshot capture complete!")
@@ -248,7 +458,7 @@ def main():
 
     # List all screenshots
     print("\nGenerated files:")
-    for f in sorted(SCREENSHOTS_DIR.glob("*.png")):
+    for f in sorted(f for f in SCREENSHOTS_DIR.iterdir() if f.suffix in (".png", ".jpg")):
         size_kb = f.stat().st_size / 1024
         print(f"  {f.name:35} {size_kb:6.1f} KB")
 
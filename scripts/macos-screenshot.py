@@ -15,6 +15,8 @@ from Quartz import (
     kCGWindowListOptionIncludingWindow,
 )
 from CoreFoundation import CFDataGetBytes, CFDataGetLength
+from PIL import Image
+import shutil
 import subprocess
 import time
 import sys
@@ -24,6 +26,13 @@ from pathlib import Path
 SCREENSHOTS_DIR = Path(__file__).parent.parent / "docs" / "screenshots"
 SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Resolved once rather than spawning `which` on every click
+CLICLICK = shutil.which('cliclick')
+
+# Filter for the 800px -web.png previews - Retina captures shrink 3-4x, where
+# BICUBIC's smaller kernel looks the same as LANCZOS and resamples faster
+WEB_RESAMPLE = Image.Resampling.BICUBIC
+
 def get_electron_window():
     """Find the main Electron window."""
     window_list = CGWindowListCopyWindowInfo(
@@ -44,6 +53,29 @@ def get_electron_window():
 
     return None
 
+# Window info from the last successful lookup - the Electron window keeps its
+# ID across in-app UI changes, so it only needs re-querying if a capture fails
+_electron_window = None
+
+def find_electron_window(refresh=False):
+    """Return the Electron window, reusing the cached lookup unless refresh is set."""
+    global _electron_window
+    if refresh or _electron_window is None:
+        _electron_window = get_electron_window()
+    return _electron_window
+
+def capture_electron(output_name, description=""):
+    """Capture the Electron window, re-finding it once if the cached ID is stale."""
+    window = find_electron_window()
+    if window and capture_window(window.get('kCGWindowNumber'), output_name, description):
+        return True
+
+    window = find_electron_window(refresh=True)
+    if window:
+        return capture_window(window.get('kCGWindowNumber'), output_name, description)
+    print(f"[ERROR] {output_name}: Electron window not found")
+    return False
+
 def capture_window(window_id, output_name, description=""):
     """Capture a specific window by its ID."""
     try:
@@ -73,12 +105,11 @@ def capture_window(window_id, output_name, description=""):
             print(f"[ERROR] screencapture failed: {result.stderr.decode()}")
             return False
 
-        # Create web-optimized version using sips
-        subprocess.run([
-            'sips', '--resampleWidth', '800',
-            str(output_path),
-            '--out', str(web_path)
-        ], capture_output=True)
+        # Create web-optimized version in-process (no second sips process,
+        # and never upscales windows narrower than 800px)
+        with Image.open(output_path) as img:
+            img.thumbnail((800, img.height), WEB_RESAMPLE)
+            img.save(web_path)
 
         size_kb = output_path.stat().st_size / 1024
         web_kb = web_path.stat().st_size / 1024 if web_path.exists() else 0
@@ -94,35 +125,74 @@ def capture_window(window_id, output_name, description=""):
         traceback.print_exc()
         return False
 
-def send_keystroke(key, modifiers=None):
-    """Send a keystroke using osascript."""
+ACTIVATE_ELECTRON = 'tell application "Electron" to activate'
+
+def keystroke(key, modifiers=None):
+    """Build an AppleScript keystroke statement."""
     if modifiers:
         mod_str = ', '.join(modifiers)
-        script = f'tell application "System Events" to keystroke "{key}" using {{{mod_str}}}'
-    else:
-        script = f'tell application "System Events" to keystroke "{key}"'
+        return f'tell application "System Events" to keystroke "{key}" using {{{mod_str}}}'
+    return f'tell application "System Events" to keystroke "{key}"'
 
-    subprocess.run(['osascript', '-e', script], capture_output=True)
-    time.sleep(0.3)
-
-def send_key_code(code, modifiers=None):
-    """Send a key code using osascript."""
+def key_code(code, modifiers=None):
+    """Build an AppleScript key code statement."""
     if modifiers:
         mod_str = ', '.join(modifiers)
-        script = f'tell application "System Events" to key code {code} using {{{mod_str}}}'
-    else:
-        script = f'tell application "System Events" to key code {code}'
+        return f'tell application "System Events" to key code {code} using {{{mod_str}}}'
+    return f'tell application "System Events" to key code {code}'
+
+def window_snapshot(window_id):
+    """Grab the raw pixel data of a window, or None if it can't be captured."""
+    image = CGWindowListCreateImage(
+        CGRectNull,
+        kCGWindowListOptionIncludingWindow,
+        window_id,
+        kCGWindowImageDefault
+    )
+    if image is None:
+        return None
+    return Quartz.CGDataProviderCopyData(Quartz.CGImageGetDataProvider(image))
+
+def wait_settled(timeout=0.8, interval=0.03, stable_polls=3):
+    """Wait until the Electron window stops redrawing, capped at timeout.
+
+    Polls the window contents instead of sleeping a fixed time after each
+    UI action, so fast machines move on as soon as the UI is idle.
+    """
+    window = find_electron_window()
+    if not window:
+        time.sleep(timeout)
+        return
 
-    subprocess.run(['osascript', '-e', script], capture_output=True)
-    time.sleep(0.3)
+    window_id = window.get('kCGWindowNumber')
+    deadline = time.monotonic() + timeout
+    previous = window_snapshot(window_id)
+    stable = 0
+    while stable < stable_polls and time.monotonic() < deadline:
+        time.sleep(interval)
+        current = window_snapshot(window_id)
+        if current is not None and current == previous:
+            stable += 1
+        else:
+            stable = 0
+        previous = current
+
+def run_applescript(*statements):
+    """Run several AppleScript statements in a single osascript process.
+
+    Each osascript launch costs tens of milliseconds, so related steps
+    (activate + keystroke, repeated keystrokes) are batched with AppleScript
+    `delay` statements between them instead of one process per key.
+    """
+    args = ['osascript']
+    for statement in statements:
+        args += ['-e', statement]
+    subprocess.run(args, capture_output=True)
+    wait_settled()
 
 def activate_electron():
     """Bring Electron to front."""
-    subprocess.run([
-        'osascript', '-e',
-        'tell application "Electron" to activate'
-    ], capture_output=True)
-    time.sleep(0.5)
+    run_applescript(ACTIVATE_ELECTRON)
 
 def click_relative(window, x_ratio, y_ratio):
     """Click at position relative to window bounds."""
@@ -136,16 +206,15 @@ def click_relative(window, x_ratio, y_ratio):
     end tell
     '''
     # Use cliclick if available, otherwise AppleScript
-    result = subprocess.run(['which', 'cliclick'], capture_output=True)
-    if result.returncode == 0:
-        subprocess.run(['cliclick', f'c:{x},{y}'], capture_output=True)
+    if CLICLICK:
+        subprocess.run([CLICLICK, f'c:{x},{y}'], capture_output=True)
     else:
         # Fallback: use mouse position setting
         subprocess.run([
             'osascript', '-e',
             f'do shell script "printf \'\\x1b[3;{y};{x}t\'"'
         ], capture_output=True)
-    time.sleep(0.3)
+    wait_settled()
 
 def main():
     print("=" * 60)
@@ -156,9 +225,8 @@ def main():
     # Find Electron window
     print("Looking for Electron window...")
     activate_electron()
-    time.sleep(0.5)
 
-    window = get_electron_window()
+    window = find_electron_window()
     if not window:
         print("ERROR: Electron window not found!")
         print("Make sure AudioBash is running.")
@@ -187,92 +255,53 @@ def main():
     print("-" * 40)
 
     # 1. Main window
-    capture_window(window_id, "01-main-window", "Main terminal window")
+    capture_electron("01-main-window", "Main terminal window")
 
     # 2. Settings panel - click gear icon (top right area)
     print("\nOpening settings...")
-    activate_electron()
     # Option+comma often opens settings, or we need to click the gear
-    send_keystroke(",", ["option down"])
-    time.sleep(0.8)
-
-    # Re-find window (might have changed)
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "02-settings-panel", "Settings panel open")
+    run_applescript(ACTIVATE_ELECTRON, "delay 0.5", keystroke(",", ["option down"]))
+    capture_electron("02-settings-panel", "Settings panel open")
 
     # Close settings
-    send_key_code(53)  # Escape key
-    time.sleep(0.3)
+    run_applescript(key_code(53))  # Escape key
 
     # 3. Voice recording - Option+S
     print("\nTriggering voice recording (Option+S)...")
-    activate_electron()
-    send_keystroke("s", ["option down"])
-    time.sleep(0.8)
-
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "03-voice-recording", "Voice recording active")
+    run_applescript(ACTIVATE_ELECTRON, "delay 0.5", keystroke("s", ["option down"]))
+    capture_electron("03-voice-recording", "Voice recording active")
 
     # Stop recording
-    send_keystroke("s", ["option down"])
-    time.sleep(0.5)
+    run_applescript(keystroke("s", ["option down"]))
 
     # 4. New tab and split view
     print("\nCreating new tab (Cmd+T)...")
-    activate_electron()
-    send_keystroke("t", ["command down"])
-    time.sleep(0.5)
+    run_applescript(ACTIVATE_ELECTRON, "delay 0.5", keystroke("t", ["command down"]))
 
     # 5. Cycle layout (Option+L)
     print("\nSwitching to split layout (Option+L)...")
-    send_keystroke("l", ["option down"])
-    time.sleep(0.5)
-
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "04-split-view-horizontal", "Horizontal split view")
+    run_applescript(keystroke("l", ["option down"]))
+    capture_electron("04-split-view-horizontal", "Horizontal split view")
 
     # Another layout
-    send_keystroke("l", ["option down"])
-    time.sleep(0.5)
-
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "05-split-view-vertical", "Vertical split view")
+    run_applescript(keystroke("l", ["option down"]))
+    capture_electron("05-split-view-vertical", "Vertical split view")
 
     # 6. Quick nav (Option+G or click folder icon)
     print("\nOpening quick navigation...")
-    activate_electron()
-    send_keystroke("g", ["option down"])
-    time.sleep(0.5)
-
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "06-quick-nav", "Quick navigation panel")
+    run_applescript(ACTIVATE_ELECTRON, "delay 0.5", keystroke("g", ["option down"]))
+    capture_electron("06-quick-nav", "Quick navigation panel")
 
     # Close nav
-    send_key_code(53)  # Escape
-    time.sleep(0.3)
+    run_applescript(key_code(53))  # Escape
 
     # 7. Back to single view
     print("\nReturning to single layout...")
-    for _ in range(4):
-        send_keystroke("l", ["option down"])
-        time.sleep(0.2)
+    cycle_layout = [keystroke("l", ["option down"]), "delay 0.5"] * 4
+    run_applescript(*cycle_layout[:-1])
 
     # 8. Clean terminal
-    time.sleep(0.3)
-    window = get_electron_window()
-    if window:
-        window_id = window.get('kCGWindowNumber')
-        capture_window(window_id, "07-terminal-clean", "Clean terminal view")
+    capture_electron("07-terminal-clean", "Clean terminal view")
 
     print()
     print("=" * 60)
@@ -10,7 +10,7 @@ import ctypes.wintypes
 import sys
 from pathlib import Path
 
-import pyautogui
+import mss
 from PIL import Image
 
 # Paths
@@ -19,14 +19,64 @@ PROJECT_DIR = SCRIPT_DIR.parent
 SCREENSHOTS_DIR = PROJECT_DIR / "docs" / "screenshots"
 SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
-# Disable pyautogui failsafe
-pyautogui.FAILSAFE = False
+# Set True when regenerating release docs: smallest PNGs, but much slower saves
+OPTIMIZE_FINAL = False
+
+# Filter for the 800px web copies - BICUBIC is cheaper than LANCZOS and the
+# difference isn't visible at this size
+WEB_RESAMPLE = Image.Resampling.BICUBIC
+
+# One mss handle for the whole session; each grab BitBlts only the requested rect.
+# Only used when PrintWindow fails, so it's created on first use.
+_sct = None
 
 # Windows API
 user32 = ctypes.windll.user32
+gdi32 = ctypes.windll.gdi32
 EnumWindowsProc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
+user32.EnumWindows.argtypes = [EnumWindowsProc, ctypes.wintypes.LPARAM]
+user32.EnumWindows.restype = ctypes.c_bool
 _found_windows = []
 
+HDC = ctypes.wintypes.HDC
+HBITMAP = ctypes.wintypes.HBITMAP
+user32.GetWindowDC.restype = HDC
+user32.GetWindowDC.argtypes = [ctypes.wintypes.HWND]
+user32.ReleaseDC.argtypes = [ctypes.wintypes.HWND, HDC]
+user32.PrintWindow.argtypes = [ctypes.wintypes.HWND, HDC, ctypes.c_uint]
+gdi32.CreateCompatibleDC.restype = HDC
+gdi32.CreateCompatibleDC.argtypes = [HDC]
+gdi32.CreateCompatibleBitmap.restype = HBITMAP
+gdi32.CreateCompatibleBitmap.argtypes = [HDC, ctypes.c_int, ctypes.c_int]
+gdi32.SelectObject.restype = ctypes.wintypes.HGDIOBJ
+gdi32.SelectObject.argtypes = [HDC, ctypes.wintypes.HGDIOBJ]
+gdi32.GetDIBits.argtypes = [HDC, HBITMAP, ctypes.c_uint, ctypes.c_uint,
+                            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint]
+gdi32.DeleteObject.argtypes = [ctypes.wintypes.HGDIOBJ]
+gdi32.DeleteDC.argtypes = [HDC]
+
+PW_RENDERFULLCONTENT = 0x00000002  # Windows 8.1+, includes GPU-composited content
+DIB_RGB_COLORS = 0
+BI_RGB = 0
+
+class BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ("biSize", ctypes.wintypes.DWORD),
+        ("biWidth", ctypes.wintypes.LONG),
+        ("biHeight", ctypes.wintypes.LONG),
+        ("biPlanes", ctypes.wintypes.WORD),
+        ("biBitCount", ctypes.wintypes.WORD),
+        ("biCompression", ctypes.wintypes.DWORD),
+        ("biSizeImage", ctypes.wintypes.DWORD),
+        ("biXPelsPerMeter", ctypes.wintypes.LONG),
+        ("biYPelsPerMeter", ctypes.wintypes.LONG),
+        ("biClrUsed", ctypes.wintypes.DWORD),
+        ("biClrImportant", ctypes.wintypes.DWORD),
+    ]
+
+# (width, height, DC, bitmap, pixel buffer) kept between captures of the same size
+_dib = None
+
 def _enum_callback(hwnd, lParam):
     if user32.IsWindowVisible(hwnd):
         length = user32.GetWindowTextLengthW(hwnd)
@@ -36,11 +86,13 @@ def _enum_callback(hwnd, lParam):
             _found_windows.append((hwnd, buffer.value))
     return True
 
+# Built once - each WINFUNCTYPE wrapper allocates a new libffi closure
+_ENUM_PROC = EnumWindowsProc(_enum_callback)
+
 def find_audiobash_window():
     """Find the AudioBash Electron window."""
-    global _found_windows
-    _found_windows = []
-    user32.EnumWindows(EnumWindowsProc(_enum_callback), 0)
+    _found_windows.clear()
+    user32.EnumWindows(_ENUM_PROC, 0)
 
     for hwnd, title in _found_windows:
         title_lower = title.lower()
@@ -58,6 +110,71 @@ def get_window_rect(hwnd):
     user32.GetWindowRect(hwnd, ctypes.byref(rect))
     return rect.left, rect.top, rect.right - rect.left, rect.bottom - rect.top
 
+def get_dib(hwnd, width, height):
+    """Return the offscreen DC, bitmap and BGRX buffer for this window size."""
+    global _dib
+    if _dib is not None and _dib[:2] == (width, height):
+        return _dib[2:]
+
+    release_dib()
+    window_dc = user32.GetWindowDC(hwnd)
+    try:
+        mem_dc = gdi32.CreateCompatibleDC(window_dc)
+        bitmap = gdi32.CreateCompatibleBitmap(window_dc, width, height)
+    finally:
+        user32.ReleaseDC(hwnd, window_dc)
+    gdi32.SelectObject(mem_dc, bitmap)
+
+    buffer = (ctypes.c_uint8 * (width * height * 4))()
+    _dib = (width, height, mem_dc, bitmap, buffer)
+    return mem_dc, bitmap, buffer
+
+def release_dib():
+    """Delete the cached offscreen DC and bitmap."""
+    global _dib
+    if _dib is not None:
+        gdi32.DeleteDC(_dib[2])
+        gdi32.DeleteObject(_dib[3])
+        _dib = None
+
+def print_window(hwnd, width, height):
+    """Have the window paint itself into the offscreen DIB; None if it refuses.
+
+    Works while AudioBash is behind other windows, and copies only the
+    window's own pixels rather than a region of the desktop.
+    """
+    mem_dc, bitmap, buffer = get_dib(hwnd, width, height)
+
+    header = BITMAPINFOHEADER()
+    header.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+    header.biWidth = width
+    header.biHeight = -height  # Top-down rows
+    header.biPlanes = 1
+    header.biBitCount = 32
+    header.biCompression = BI_RGB
+
+    if not user32.PrintWindow(hwnd, mem_dc, PW_RENDERFULLCONTENT):
+        return None
+    gdi32.GetDIBits(mem_dc, bitmap, 0, height, buffer,
+                    ctypes.byref(header), DIB_RGB_COLORS)
+
+    # The BGRX -> RGB decode copies, so the buffer is free for the next shot
+    return Image.frombuffer('RGB', (width, height), buffer, 'raw', 'BGRX', 0, 1)
+
+def get_sct():
+    """Return the session's mss handle, opening it on first use."""
+    global _sct
+    if _sct is None:
+        _sct = mss.mss()
+    return _sct
+
+def release_sct():
+    """Close the mss handle if the fallback ever opened one."""
+    global _sct
+    if _sct is not None:
+        _sct.close()
+        _sct = None
+
 def capture_window(hwnd, name: str):
     """Capture window screenshot without bringing to front or sending keys."""
     try:
@@ -72,21 +189,24 @@ def capture_window(hwnd, name: str):
         # Small delay for any UI to settle
         time.sleep(0.2)
 
-        # Capture
-        screenshot = pyautogui.screenshot(region=(left, top, width, height))
+        # Capture - PrintWindow first, falling back to a screen grab of the
+        # window rect if the window can't render itself offscreen
+        screenshot = print_window(hwnd, width, height)
+        if screenshot is None:
+            monitor = {"left": left, "top": top, "width": width, "height": height}
+            raw = get_sct().grab(monitor)
+            screenshot = Image.frombytes('RGB', raw.size, raw.bgra, 'raw', 'BGRX')
 
         # Save full size
         output_path = SCREENSHOTS_DIR / f"{name}.png"
-        screenshot.save(output_path, optimize=True)
+        screenshot.save(output_path, optimize=OPTIMIZE_FINAL, compress_level=1)
 
         # Web optimized
         web_path = SCREENSHOTS_DIR / f"{name}-web.png"
-        web_img = screenshot.copy()
-        if web_img.width > 800:
-            ratio = 800 / web_img.width
-            new_size = (800, int(web_img.height * ratio))
-            web_img = web_img.resize(new_size, Image.Resampling.LANCZOS)
-        web_img.save(web_path, optimize=True)
+        if screenshot.width > 800:
+            # In place - the full-size image is already on disk
+            screenshot.thumbnail((800, screenshot.height), WEB_RESAMPLE)
+        screenshot.save(web_path, optimize=OPTIMIZE_FINAL, compress_level=6)
 
         print(f"[OK] Saved: {name}.png ({output_path.stat().st_size // 1024}KB)")
         return True
@@ -143,6 +263,9 @@ def main():
 
         capture_window(hwnd, name)
 
+    release_dib()
+    release_sct()
+
     print()
     print("=" * 60)
     print("Done! Screenshots saved to:")
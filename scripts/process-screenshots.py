@@ -2,14 +2,33 @@
 Process manually captured screenshots:
 1. Rename to meaningful names
 2. Create web-optimized versions (800px max width)
+
+Requirements:
+- pip install pillow
+- Optional, for SIMD-accelerated resizing (same API, no code changes):
+  pip uninstall pillow && pip install pillow-simd
 """
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from PIL import Image
+import os
 import shutil
 
 SCREENSHOTS_DIR = Path(__file__).parent.parent / "docs" / "screenshots"
 
+# Flip on for release docs - optimize=True tries every zlib strategy, which is
+# several times slower for a few percent smaller files
+OPTIMIZE_FINAL = False
+
+# Downscale filter for -web images (4x4 taps vs LANCZOS's 6x6, same look at 800px)
+WEB_RESAMPLE = Image.Resampling.BICUBIC
+
+# Shrinks milder than this (e.g. 1000px -> 800px) use BILINEAR instead - its
+# 2x2 kernel is ~35% faster and looks the same when barely downscaling
+LIGHT_SHRINK_RATIO = 0.5
+LIGHT_SHRINK_RESAMPLE = Image.Resampling.BILINEAR
+
 # Mapping of original filenames to new names and descriptions
 RENAME_MAP = {
     "2026-01-02 15_06_05-AudioBash.png": ("quick-nav", "Quick navigation panel"),
@@ -29,45 +48,69 @@ def create_web_optimized(source_path: Path, max_width: int = 800) -> Path:
     if img.width > max_width:
         ratio = max_width / img.width
         new_size = (max_width, int(img.height * ratio))
-        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        # JPEG sources can be DCT-scaled towards the target while decoding
+        # (no-op for PNG)
+        img.draft(img.mode, new_size)
+        # Ratio against the (possibly draft-reduced) decoded width
+        resample = (LIGHT_SHRINK_RESAMPLE if max_width / img.width > LIGHT_SHRINK_RATIO
+                    else WEB_RESAMPLE)
+        img = img.resize(new_size, resample)
 
     web_path = source_path.with_name(source_path.stem + "-web" + source_path.suffix)
-    img.save(web_path, optimize=True)
+    img.save(web_path, optimize=OPTIMIZE_FINAL, compress_level=6)
 
     return web_path
 
-def main():
-    print("Processing screenshots...")
-    print("=" * 50)
+def process_screenshot(old_name: str, new_name: str, description: str) -> tuple[list[str], str]:
+    """Rename one screenshot and create its web version.
+
+    Returns the names of the files written and the report text.
+    """
+    old_path = SCREENSHOTS_DIR / old_name
+    new_path = SCREENSHOTS_DIR / f"{new_name}.png"
+
+    if not old_path.exists():
+        return [], f"[SKIP] {old_name} - not found"
 
-    for old_name, (new_name, description) in RENAME_MAP.items():
-        old_path = SCREENSHOTS_DIR / old_name
-        new_path = SCREENSHOTS_DIR / f"{new_name}.png"
+    # Rename
+    shutil.move(old_path, new_path)
 
-        if not old_path.exists():
-            print(f"[SKIP] {old_name} - not found")
-            continue
+    # Create web version
+    web_path = create_web_optimized(new_path)
 
-        # Rename
-        shutil.move(old_path, new_path)
-        print(f"[RENAME] {old_name}")
-        print(f"      -> {new_name}.png ({description})")
+    # Get sizes
+    full_size = new_path.stat().st_size / 1024
+    web_size = web_path.stat().st_size / 1024
 
-        # Create web version
-        web_path = create_web_optimized(new_path)
+    return [new_path.name, web_path.name], "\n".join([
+        f"[RENAME] {old_name}",
+        f"      -> {new_name}.png ({description})",
+        f"      -> {new_name}-web.png ({web_size:.1f}KB from {full_size:.1f}KB)",
+        "",
+    ])
 
-        # Get sizes
-        full_size = new_path.stat().st_size / 1024
-        web_size = web_path.stat().st_size / 1024
+def main():
+    print("Processing screenshots...")
+    print("=" * 50)
 
-        print(f"      -> {new_name}-web.png ({web_size:.1f}KB from {full_size:.1f}KB)")
-        print()
+    # Each file is independent and CPU-bound (decode/resize/encode), so spread
+    # them across processes; at least 2 so one file's I/O overlaps another's work
+    workers = max(2, os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(process_screenshot, old_name, new_name, description)
+            for old_name, (new_name, description) in RENAME_MAP.items()
+        ]
+        produced = []
+        for future in as_completed(futures):
+            names, report = future.result()
+            produced.extend(names)
+            print(report)
 
     print("=" * 50)
     print("Done! New screenshots:")
-    for f in sorted(SCREENSHOTS_DIR.glob("*.png")):
-        if not f.stem.startswith("0"):  # Skip old numbered ones
-            print(f"  {f.name}")
+    for name in sorted(produced):
+        print(f"  {name}")
 
 if __name__ == "__main__":
     main()
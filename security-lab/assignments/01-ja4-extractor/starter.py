@@ -15,7 +15,7 @@ import hashlib
 import struct
 import sys
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Iterator, Optional, List, Tuple
 
 # ============================================
 # Constants (provided - do not modify)
@@ -244,26 +244,29 @@ def calculate_ja4(client_hello: ClientHello) -> JA4Fingerprint:
 # PCAP Parsing (provided - study this code)
 # ============================================
 
-def extract_from_pcap(pcap_path: str) -> List[Tuple[str, JA4Fingerprint]]:
+def extract_from_pcap(pcap_path: str) -> Iterator[Tuple[str, JA4Fingerprint]]:
     """
     Extract JA4 fingerprints from pcap file.
 
     This function is provided for you. Study it to understand
     how ClientHello messages are extracted from packets.
+
+    Packets are read one at a time with PcapReader (rdpcap would load the
+    whole capture into memory first), and each fingerprint is yielded as
+    soon as it's found.
     """
     try:
-        from scapy.all import rdpcap, IP
+        from scapy.all import PcapReader, IP
         from scapy.layers.tls.handshake import TLSClientHello
         from scapy.layers.tls.record import TLS
     except ImportError:
         print("Error: scapy required. Install: pip install scapy")
-        return []
-
-    results = []
-    packets = rdpcap(pcap_path)
+        return
 
-    for pkt in packets:
-        if pkt.haslayer(TLS) and pkt.haslayer(TLSClientHello):
+    with PcapReader(pcap_path) as packets:
+        for pkt in packets:
+            if not (pkt.haslayer(TLS) and pkt.haslayer(TLSClientHello)):
+                continue
             try:
                 ch = pkt[TLSClientHello]
 
@@ -301,12 +304,12 @@ def extract_from_pcap(pcap_path: str) -> List[Tuple[str, JA4Fingerprint]]:
                 # Calculate fingerprint
                 ja4 = calculate_ja4(client_hello)
                 source_ip = pkt[IP].src if pkt.haslayer(IP) else "unknown"
-                results.append((source_ip, ja4))
 
             except Exception as e:
                 print(f"Error: {e}", file=sys.stderr)
+                continue
 
-    return results
+            yield source_ip, ja4
 
 
 # ============================================
@@ -325,14 +328,8 @@ def main():
     print(f"Extracting JA4 fingerprints from: {pcap_path}")
     print("-" * 60)
 
-    results = extract_from_pcap(pcap_path)
-
-    if not results:
-        print("No TLS ClientHello messages found.")
-        print("Make sure scapy is installed and pcap contains TLS traffic.")
-        return
-
-    for source_ip, ja4 in results:
+    total = 0
+    for total, (source_ip, ja4) in enumerate(extract_from_pcap(pcap_path), 1):
         print(f"Source: {source_ip}")
         print(f"  JA4:   {ja4.full}")
         print(f"  JA4_a: {ja4.a}")
@@ -340,7 +337,12 @@ def main():
         print(f"  JA4_c: {ja4.c}")
         print()
 
-    print(f"Total fingerprints: {len(results)}")
+    if total == 0:
+        print("No TLS ClientHello messages found.")
+        print("Make sure scapy is installed and pcap contains TLS traffic.")
+        return
+
+    print(f"Total fingerprints: {total}")
 
 
 if __name__ == "__main__":
@@ -69,6 +69,14 @@ CREATE TABLE observed_fingerprints (
     detection_reasons TEXT[]
 );
 
+-- Per-classification counters for /stats, kept up to date by triggers on
+-- observed_fingerprints so totals don't need a table scan
+CREATE TABLE fingerprint_stats_rollup (
+    classification VARCHAR(50) UNIQUE NULLS NOT DISTINCT,
+    count BIGINT NOT NULL DEFAULT 0,
+    sum_score DOUBLE PRECISION NOT NULL DEFAULT 0.0
+);
+
 -- Detection events (alerts/logs)
 CREATE TABLE detection_events (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -139,6 +147,8 @@ CREATE INDEX idx_known_application ON known_fingerprints(application);
 CREATE INDEX idx_known_is_browser ON known_fingerprints(is_browser);
 
 CREATE INDEX idx_observed_ja4 ON observed_fingerprints(ja4);
+-- One row per client fingerprint; also the ON CONFLICT target for /analyze upserts
+CREATE UNIQUE INDEX idx_observed_ja4_source_ip ON observed_fingerprints(ja4, source_ip);
 CREATE INDEX idx_observed_ja4_a ON observed_fingerprints(ja4_a);
 CREATE INDEX idx_observed_source_ip ON observed_fingerprints(source_ip);
 CREATE INDEX idx_observed_first_seen ON observed_fingerprints(first_seen);
@@ -171,6 +181,53 @@ CREATE TRIGGER known_fingerprints_updated
     BEFORE UPDATE ON known_fingerprints
     FOR EACH ROW EXECUTE FUNCTION update_timestamp();
 
+-- Maintain fingerprint_stats_rollup as observations are added/removed.
+-- Only new rows fire the insert trigger - an /analyze upsert that bumps
+-- hit_count on an existing row leaves the counts alone, matching COUNT(*).
+CREATE OR REPLACE FUNCTION rollup_observation_insert()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO fingerprint_stats_rollup (classification, count, sum_score)
+    VALUES (NEW.classification, 1, COALESCE(NEW.anomaly_score, 0.0))
+    ON CONFLICT (classification) DO UPDATE SET
+        count = fingerprint_stats_rollup.count + 1,
+        sum_score = fingerprint_stats_rollup.sum_score + EXCLUDED.sum_score;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION rollup_observation_delete()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE fingerprint_stats_rollup SET
+        count = count - 1,
+        sum_score = sum_score - COALESCE(OLD.anomaly_score, 0.0)
+    WHERE classification IS NOT DISTINCT FROM OLD.classification;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER observed_fingerprints_rollup_insert
+    AFTER INSERT ON observed_fingerprints
+    FOR EACH ROW EXECUTE FUNCTION rollup_observation_insert();
+
+CREATE TRIGGER observed_fingerprints_rollup_delete
+    AFTER DELETE ON observed_fingerprints
+    FOR EACH ROW EXECUTE FUNCTION rollup_observation_delete();
+
+-- TRUNCATE (lab reset) skips row triggers, so clear the rollup with it
+CREATE OR REPLACE FUNCTION rollup_observation_truncate()
+RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE fingerprint_stats_rollup;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER observed_fingerprints_rollup_truncate
+    AFTER TRUNCATE ON observed_fingerprints
+    FOR EACH STATEMENT EXECUTE FUNCTION rollup_observation_truncate();
+
 -- Parse JA4 into components
 CREATE OR REPLACE FUNCTION parse_ja4(ja4_input VARCHAR)
 RETURNS TABLE(ja4_a VARCHAR, ja4_b VARCHAR, ja4_c VARCHAR) AS $$
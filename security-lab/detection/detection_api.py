@@ -11,15 +11,30 @@ Endpoints:
     GET /stats        - Detection statistics
 """
 
+import atexit
+import io
+import ipaddress
 import os
+import queue
 import re
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional
 
+import numpy as np
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import DataError, IntegrityError
+from psycopg2.errors import UniqueViolation
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 app = Flask(__name__)
 CORS(app)
@@ -31,9 +46,62 @@ DATABASE_URL = os.environ.get(
 )
 
 
+# Shared across requests; created on first use so the module imports without a database
+DB_POOL_MIN = 2
+DB_POOL_MAX = 16
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+# getconn() raises PoolError instead of waiting when all connections are out,
+# so callers queue here for a free slot first
+_db_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+
+
+def get_db_pool() -> ThreadedConnectionPool:
+    """Return the connection pool, creating it on first call."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = ThreadedConnectionPool(
+                    minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+                    dsn=DATABASE_URL, cursor_factory=RealDictCursor
+                )
+    return _db_pool
+
+
+@contextmanager
 def get_db():
-    """Get database connection."""
-    return psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    """
+    Borrow a pooled database connection for one transaction.
+
+    The block commits on success and rolls back on error, then the
+    connection goes back to the pool instead of being closed. Blocks
+    while all DB_POOL_MAX connections are in use.
+    """
+    pool = get_db_pool()
+    with _db_pool_slots:
+        conn = pool.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            pool.putconn(conn)
+
+
+@contextmanager
+def bulk_ingest():
+    """
+    Like get_db(), but the commit doesn't wait for the WAL flush.
+
+    For bulk writes of data that is cheap to lose: on a database crash the
+    last fraction of a second of commits may be dropped, but nothing is
+    corrupted. SET LOCAL limits this to the one transaction.
+    """
+    with get_db() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit = OFF")
+        yield conn
 
 
 # ============================================
@@ -55,9 +123,35 @@ AUTOMATION_PATTERNS = {
     'go_http': re.compile(r't13d1[012]\d{2}h2'),
 }
 
+# Both tables as one regex with a named group per entry, so each request does a
+# single match. Alternation takes the first branch that matches, so automation
+# patterns come first - they win over a browser match, as in the tables above.
+FINGERPRINT_PATTERN = re.compile('|'.join(
+    f'(?P<{name}>{pattern.pattern})'
+    for name, pattern in {**AUTOMATION_PATTERNS, **BROWSER_PATTERNS}.items()
+))
+
+BROWSER_NAMES = frozenset(BROWSER_PATTERNS)
+AUTOMATION_NAMES = frozenset(AUTOMATION_PATTERNS)
+
+
+# Full fingerprint accepted by the API, e.g. t13d1516h2_8daaf6152771_e5627efa2ab1
+JA4_PATTERN = re.compile(r'^[a-z]\d{2}[di]\d{4}[a-z0-9]{2}_[a-f0-9]{12}_[a-f0-9]{12}$')
+
+# Fixed layout of the JA4 'a' component, e.g. t13d1516h2
+JA4_A_PATTERN = re.compile(
+    r'(?P<protocol>[a-z])(?P<tls_version>\d{2})(?P<sni>[di])'
+    r'(?P<cipher_count>\d{2})(?P<ext_count>\d{2})(?P<alpn>[a-z0-9]{2})'
+)
 
-def parse_ja4(ja4: str) -> dict:
-    """Parse JA4 into components."""
+
+@lru_cache(maxsize=4096)
+def parse_ja4(ja4: str) -> Optional[Mapping]:
+    """
+    Parse JA4 into components, or None if it isn't a valid a_b_c fingerprint.
+
+    Results are cached and shared between callers, so they're read-only.
+    """
     parts = ja4.split('_')
     if len(parts) != 3:
         return None
@@ -65,18 +159,19 @@ def parse_ja4(ja4: str) -> dict:
     ja4_a = parts[0]
 
     # Parse the 'a' component
-    return {
+    match = JA4_A_PATTERN.fullmatch(ja4_a)
+    if not match:
+        return None
+
+    return MappingProxyType({
         'full': ja4,
         'a': ja4_a,
         'b': parts[1],
         'c': parts[2],
-        'protocol': ja4_a[0] if len(ja4_a) > 0 else None,
-        'tls_version': ja4_a[1:3] if len(ja4_a) > 2 else None,
-        'sni': ja4_a[3] if len(ja4_a) > 3 else None,
-        'cipher_count': int(ja4_a[4:6]) if len(ja4_a) > 5 else None,
-        'ext_count': int(ja4_a[6:8]) if len(ja4_a) > 7 else None,
-        'alpn': ja4_a[8:10] if len(ja4_a) > 9 else None,
-    }
+        **match.groupdict(),
+        'cipher_count': int(match['cipher_count']),
+        'ext_count': int(match['ext_count']),
+    })
 
 
 def extract_browser_from_ua(user_agent: str) -> Optional[str]:
@@ -105,58 +200,41 @@ def extract_browser_from_ua(user_agent: str) -> Optional[str]:
     return 'unknown'
 
 
-def detect_ua_fingerprint_mismatch(ja4: str, user_agent: str) -> dict:
+@lru_cache(maxsize=4096)
+def classify_fingerprint(ja4_a: str, claimed_browser: Optional[str]) -> tuple:
     """
-    Detect mismatch between claimed User-Agent and TLS fingerprint.
+    Compare a JA4_a component with the browser claimed by the User-Agent.
+
+    Pure function of its inputs, so results are cached - the same browser
+    build sends the same fingerprint and UA on every request. Call
+    classify_fingerprint.cache_clear() if the pattern tables change at runtime.
 
     Returns:
-        dict with 'mismatch' (bool), 'score' (0-1), 'reason' (str)
+        (fingerprint_browser, mismatch, score, reason)
     """
-    parsed = parse_ja4(ja4)
-    if not parsed:
-        return {'mismatch': False, 'score': 0, 'reason': 'Invalid JA4'}
-
-    claimed_browser = extract_browser_from_ua(user_agent)
-    ja4_a = parsed['a']
-
-    result = {
-        'mismatch': False,
-        'score': 0.0,
-        'reason': None,
-        'claimed': claimed_browser,
-        'fingerprint_suggests': None
-    }
+    match = FINGERPRINT_PATTERN.match(ja4_a)
+    fingerprint_browser = match.lastgroup if match else None
 
-    # Check what the fingerprint suggests
-    fingerprint_browser = None
-    for browser, pattern in BROWSER_PATTERNS.items():
-        if pattern.match(ja4_a):
-            fingerprint_browser = browser
-            break
-
-    for tool, pattern in AUTOMATION_PATTERNS.items():
-        if pattern.match(ja4_a):
-            fingerprint_browser = tool
-            break
-
-    result['fingerprint_suggests'] = fingerprint_browser
+    mismatch = False
+    score = 0.0
+    reason = None
 
     # Detect mismatches
-    if claimed_browser in ['chrome', 'firefox', 'safari', 'edge']:
+    if claimed_browser in BROWSER_NAMES:
         # Claiming to be a browser
-        if fingerprint_browser in ['python_requests', 'curl', 'go_http']:
-            result['mismatch'] = True
-            result['score'] = 0.9
-            result['reason'] = f"Claims {claimed_browser} but fingerprint matches {fingerprint_browser}"
+        if fingerprint_browser in AUTOMATION_NAMES:
+            mismatch = True
+            score = 0.9
+            reason = f"Claims {claimed_browser} but fingerprint matches {fingerprint_browser}"
         elif fingerprint_browser and fingerprint_browser != claimed_browser:
             # Different browser
             if claimed_browser == 'edge' and fingerprint_browser == 'chrome':
                 # Edge uses Chromium, this is OK
                 pass
             else:
-                result['mismatch'] = True
-                result['score'] = 0.5
-                result['reason'] = f"Claims {claimed_browser} but fingerprint matches {fingerprint_browser}"
+                mismatch = True
+                score = 0.5
+                reason = f"Claims {claimed_browser} but fingerprint matches {fingerprint_browser}"
 
     elif claimed_browser in ['python', 'curl', 'go']:
         # Honest about being a tool - that's fine
@@ -164,10 +242,35 @@ def detect_ua_fingerprint_mismatch(ja4: str, user_agent: str) -> dict:
 
     else:
         # Unknown UA
-        result['score'] = 0.2
-        result['reason'] = "Unknown or missing User-Agent"
+        score = 0.2
+        reason = "Unknown or missing User-Agent"
+
+    return fingerprint_browser, mismatch, score, reason
 
-    return result
+
+def detect_ua_fingerprint_mismatch(ja4: str, user_agent: str) -> dict:
+    """
+    Detect mismatch between claimed User-Agent and TLS fingerprint.
+
+    Returns:
+        dict with 'mismatch' (bool), 'score' (0-1), 'reason' (str)
+    """
+    parsed = parse_ja4(ja4)
+    if not parsed:
+        return {'mismatch': False, 'score': 0, 'reason': 'Invalid JA4'}
+
+    claimed_browser = extract_browser_from_ua(user_agent)
+    fingerprint_browser, mismatch, score, reason = classify_fingerprint(
+        parsed['a'], claimed_browser
+    )
+
+    return {
+        'mismatch': mismatch,
+        'score': score,
+        'reason': reason,
+        'claimed': claimed_browser,
+        'fingerprint_suggests': fingerprint_browser
+    }
 
 
 def detect_behavioral_anomalies(session_data: dict) -> dict:
@@ -183,25 +286,14 @@ def detect_behavioral_anomalies(session_data: dict) -> dict:
         'score': 0.0
     }
 
-    request_times = session_data.get('request_times', [])
-    if len(request_times) < 2:
+    request_times = np.asarray(session_data.get('request_times', []), dtype=np.float64)
+    if request_times.size < 2:
         return result
 
     # Calculate inter-request delays
-    delays = []
-    for i in range(1, len(request_times)):
-        delay = request_times[i] - request_times[i-1]
-        delays.append(delay)
-
-    if not delays:
-        return result
-
-    avg_delay = sum(delays) / len(delays)
-    min_delay = min(delays)
-    max_delay = max(delays)
-
-    # Calculate variance
-    variance = sum((d - avg_delay) ** 2 for d in delays) / len(delays)
+    delays = np.diff(request_times)
+    min_delay = delays.min()
+    variance = delays.var()
 
     # Anomaly: Superhuman speed
     if min_delay < 0.05:  # < 50ms
@@ -222,7 +314,7 @@ def detect_behavioral_anomalies(session_data: dict) -> dict:
         result['score'] += 0.3
 
     # Anomaly: High request rate
-    total_time = request_times[-1] - request_times[0] if request_times else 0
+    total_time = request_times[-1] - request_times[0]
     if total_time > 0:
         rate = len(request_times) / total_time
         if rate > 10:  # > 10 requests per second sustained
@@ -237,32 +329,26 @@ def detect_behavioral_anomalies(session_data: dict) -> dict:
     return result
 
 
-def calculate_combined_score(
-    ja4: str,
-    user_agent: str,
-    session_data: Optional[dict] = None
-) -> dict:
+@lru_cache(maxsize=16384)
+def score_fingerprint(ja4: str, user_agent: str) -> tuple:
     """
-    Calculate combined detection score from multiple signals.
+    Score the signals that depend only on (ja4, user_agent).
 
-    Returns comprehensive analysis result.
+    Cached: a handful of client builds account for most traffic. The known
+    fingerprint lookup is cached with it, so call score_fingerprint.cache_clear()
+    after editing known_fingerprints on a running server.
+
+    Returns:
+        (ua_check, known_signal, score, reasons) - shared, treat as read-only
     """
-    result = {
-        'ja4': ja4,
-        'user_agent': user_agent,
-        'timestamp': datetime.utcnow().isoformat(),
-        'signals': {},
-        'total_score': 0.0,
-        'classification': 'unknown',
-        'reasons': []
-    }
+    score = 0.0
+    reasons = []
 
     # Signal 1: UA/Fingerprint mismatch
     ua_check = detect_ua_fingerprint_mismatch(ja4, user_agent)
-    result['signals']['ua_fingerprint'] = ua_check
     if ua_check['mismatch']:
-        result['total_score'] += ua_check['score'] * 0.5
-        result['reasons'].append(ua_check['reason'])
+        score += ua_check['score'] * 0.5
+        reasons.append(ua_check['reason'])
 
     # Signal 2: Known fingerprint lookup
     with get_db() as conn:
@@ -273,7 +359,7 @@ def calculate_combined_score(
             known = cur.fetchone()
 
             if known:
-                result['signals']['known_fingerprint'] = {
+                known_signal = {
                     'found': True,
                     'application': known['application'],
                     'is_browser': known['is_browser'],
@@ -281,12 +367,41 @@ def calculate_combined_score(
                 }
 
                 if known['is_malicious']:
-                    result['total_score'] += 0.8
-                    result['reasons'].append(f"Known malicious fingerprint: {known['application']}")
+                    score += 0.8
+                    reasons.append(f"Known malicious fingerprint: {known['application']}")
             else:
-                result['signals']['known_fingerprint'] = {'found': False}
-                result['total_score'] += 0.1
-                result['reasons'].append("Unknown fingerprint")
+                known_signal = {'found': False}
+                score += 0.1
+                reasons.append("Unknown fingerprint")
+
+    return ua_check, known_signal, score, tuple(reasons)
+
+
+def calculate_combined_score(
+    ja4: str,
+    user_agent: str,
+    session_data: Optional[dict] = None
+) -> dict:
+    """
+    Calculate combined detection score from multiple signals.
+
+    Returns comprehensive analysis result.
+    """
+    ua_check, known_signal, score, reasons = score_fingerprint(ja4, user_agent)
+
+    # Fresh containers each call - callers add fields to the result
+    result = {
+        'ja4': ja4,
+        'user_agent': user_agent,
+        'timestamp': datetime.utcnow().isoformat(),
+        'signals': {
+            'ua_fingerprint': dict(ua_check),
+            'known_fingerprint': dict(known_signal),
+        },
+        'total_score': score,
+        'classification': 'unknown',
+        'reasons': list(reasons)
+    }
 
     # Signal 3: Behavioral analysis (if session data provided)
     if session_data:
@@ -309,6 +424,214 @@ def calculate_combined_score(
     return result
 
 
+# ============================================
+# Observation Writer
+# ============================================
+
+# /analyze queues its observed_fingerprints row and returns; a background
+# thread writes the queue out as multi-row upserts, so a burst of requests
+# shares one round trip and one commit instead of paying for one each
+OBSERVATION_BATCH_SIZE = 500
+OBSERVATION_FLUSH_INTERVAL = 0.1  # seconds to wait for a batch to fill
+
+_observation_queue = queue.Queue()
+_observation_writer = None
+_observation_writer_lock = threading.Lock()
+_STOP_WRITER = object()
+
+
+def record_observation(row: tuple) -> None:
+    """
+    Queue an observation for the background writer.
+
+    row is (ja4, ja4_a, ja4_b, ja4_c, source_ip, user_agent,
+            anomaly_score, classification, detection_reasons).
+    """
+    global _observation_writer
+    if _observation_writer is None:
+        with _observation_writer_lock:
+            if _observation_writer is None:
+                _observation_writer = threading.Thread(
+                    target=observation_writer_loop, name='observation-writer', daemon=True
+                )
+                _observation_writer.start()
+                atexit.register(flush_observations)
+    _observation_queue.put(row)
+
+
+INSERT_OBSERVATIONS = """
+    INSERT INTO observed_fingerprints
+    (ja4, ja4_a, ja4_b, ja4_c, source_ip, user_agent,
+     anomaly_score, classification, detection_reasons, hit_count)
+    VALUES %s
+"""
+
+UPSERT_OBSERVATIONS = INSERT_OBSERVATIONS + """
+    ON CONFLICT (ja4, source_ip) DO UPDATE SET
+        hit_count = observed_fingerprints.hit_count + EXCLUDED.hit_count,
+        last_seen = CURRENT_TIMESTAMP
+"""
+
+# First sightings go in through COPY - same columns as INSERT_OBSERVATIONS
+COPY_OBSERVATIONS = """
+    COPY observed_fingerprints
+    (ja4, ja4_a, ja4_b, ja4_c, source_ip, user_agent,
+     anomaly_score, classification, detection_reasons, hit_count)
+    FROM STDIN
+"""
+
+# Backslash escapes for COPY's text format
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_field(value) -> str:
+    """Format one value as a COPY text-format field."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, (list, tuple)):
+        # TEXT[] literal, each element quoted
+        value = '{' + ','.join(
+            '"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"'
+            for item in value
+        ) + '}'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def copy_rows(rows: list) -> io.StringIO:
+    """Render rows as a COPY FROM STDIN text stream."""
+    buf = io.StringIO()
+    for row in rows:
+        buf.write('\t'.join(map(copy_field, row)))
+        buf.write('\n')
+    buf.seek(0)
+    return buf
+
+
+# (ja4, source_ip) pairs this process has already written, most recent last.
+# Unseen pairs are almost always first sightings and take a plain INSERT;
+# only the writer thread touches this, so it needs no lock.
+SEEN_OBSERVATIONS_LIMIT = 100_000
+_seen_observations = OrderedDict()
+
+
+def remember_observations(keys) -> None:
+    """Mark (ja4, source_ip) pairs as present in the table."""
+    for key in keys:
+        _seen_observations[key] = None
+        _seen_observations.move_to_end(key)
+    while len(_seen_observations) > SEEN_OBSERVATIONS_LIMIT:
+        _seen_observations.popitem(last=False)
+
+
+def write_observations(rows: list) -> None:
+    """Write a batch of observations: plain INSERT for new pairs, upsert for the rest."""
+    # One upsert can't touch the same row twice, so repeats of a
+    # (ja4, source_ip) pair are folded into a single row with a hit count
+    merged = {}
+    for row in rows:
+        key = (row[0], row[4])
+        if key in merged:
+            first, hits = merged[key]
+            merged[key] = (first, hits + 1)
+        else:
+            merged[key] = (row, 1)
+
+    new_rows = []
+    known_rows = []
+    for key, (row, hits) in merged.items():
+        (known_rows if key in _seen_observations else new_rows).append(row + (hits,))
+
+    # Observations are telemetry - no need to wait on fsync for each batch
+    with bulk_ingest() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SAVEPOINT observations")
+            try:
+                write_observation_batch(cur, new_rows, known_rows)
+            except (DataError, IntegrityError) as e:
+                # One bad row fails the whole statement - redo the batch row
+                # by row so only the offending rows are dropped
+                app.logger.warning(f"Observation batch rejected, retrying per row: {e}")
+                cur.execute("ROLLBACK TO SAVEPOINT observations")
+                rejected = write_observation_rows(cur, new_rows + known_rows)
+                for key in rejected:
+                    del merged[key]
+
+    remember_observations(merged)
+
+
+def write_observation_batch(cur, new_rows: list, known_rows: list) -> None:
+    """COPY the unseen pairs and upsert the known ones."""
+    if new_rows:
+        # COPY skips per-row statement parsing. Another process may have
+        # written a pair first - undo just the COPY and send those rows
+        # through the upsert
+        cur.execute("SAVEPOINT new_observations")
+        try:
+            cur.copy_expert(COPY_OBSERVATIONS, copy_rows(new_rows))
+        except UniqueViolation:
+            cur.execute("ROLLBACK TO SAVEPOINT new_observations")
+            known_rows = known_rows + new_rows
+    if known_rows:
+        execute_values(cur, UPSERT_OBSERVATIONS, known_rows)
+
+
+def write_observation_rows(cur, rows: list) -> list:
+    """Upsert rows one at a time, skipping any the database rejects.
+
+    Returns the (ja4, source_ip) keys of the rejected rows.
+    """
+    rejected = []
+    for row in rows:
+        cur.execute("SAVEPOINT observation_row")
+        try:
+            execute_values(cur, UPSERT_OBSERVATIONS, [row])
+        except (DataError, IntegrityError) as e:
+            cur.execute("ROLLBACK TO SAVEPOINT observation_row")
+            app.logger.error(f"Dropped observation {row[0]} from {row[4]!r}: {e}")
+            rejected.append((row[0], row[4]))
+        else:
+            cur.execute("RELEASE SAVEPOINT observation_row")
+    return rejected
+
+
+def observation_writer_loop() -> None:
+    """Drain the observation queue in batches until told to stop."""
+    while True:
+        batch = []
+        stop = False
+
+        item = _observation_queue.get()
+        deadline = time.monotonic() + OBSERVATION_FLUSH_INTERVAL
+        while True:
+            if item is _STOP_WRITER:
+                stop = True
+                break
+            batch.append(item)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= OBSERVATION_BATCH_SIZE or remaining <= 0:
+                break
+            try:
+                item = _observation_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        if batch:
+            try:
+                write_observations(batch)
+            except Exception as e:
+                app.logger.error(f"Database error: {e}")
+
+        if stop:
+            return
+
+
+def flush_observations(timeout: float = 5.0) -> None:
+    """Write out anything still queued and stop the writer thread."""
+    if _observation_writer is not None and _observation_writer.is_alive():
+        _observation_queue.put(_STOP_WRITER)
+        _observation_writer.join(timeout)
+
+
 # ============================================
 # API Endpoints
 # ============================================
@@ -319,6 +642,23 @@ def health():
     return jsonify({'status': 'ok', 'timestamp': datetime.utcnow().isoformat()})
 
 
+def is_ja4(value) -> bool:
+    """True if value is a JA4 fingerprint string."""
+    return isinstance(value, str) and JA4_PATTERN.match(value) is not None
+
+
+def is_inet(value) -> bool:
+    """True if value is an IP address string PostgreSQL's INET type accepts."""
+    if not isinstance(value, str):
+        return False
+    try:
+        address = ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    # ipaddress allows IPv6 zone ids (fe80::1%eth0), INET doesn't
+    return getattr(address, 'scope_id', None) is None
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze():
     """
@@ -346,38 +686,35 @@ def analyze():
     session_data = data.get('session_data')
 
     # Validate JA4 format
-    if not re.match(r'^[a-z]\d{2}[di]\d{4}[a-z0-9]{2}_[a-f0-9]{12}_[a-f0-9]{12}$', ja4):
+    if not is_ja4(ja4):
         return jsonify({'error': 'Invalid JA4 format'}), 400
 
+    # Observations are written in shared batches, so reject anything the
+    # database would refuse here rather than let it fail other clients' rows
+    if user_agent is not None and (not isinstance(user_agent, str) or '\x00' in user_agent):
+        return jsonify({'error': 'Invalid user_agent'}), 400
+    if not is_inet(source_ip):
+        return jsonify({'error': 'Invalid source_ip'}), 400
+
     result = calculate_combined_score(ja4, user_agent, session_data)
     result['source_ip'] = source_ip
 
-    # Store observation
-    try:
-        parsed = parse_ja4(ja4)
-        with get_db() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO observed_fingerprints
-                    (ja4, ja4_a, ja4_b, ja4_c, source_ip, user_agent,
-                     anomaly_score, classification, detection_reasons)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (ja4, source_ip) DO UPDATE SET
-                        hit_count = observed_fingerprints.hit_count + 1,
-                        last_seen = CURRENT_TIMESTAMP
-                """, (
-                    ja4, parsed['a'], parsed['b'], parsed['c'],
-                    source_ip, user_agent,
-                    result['total_score'], result['classification'],
-                    result['reasons']
-                ))
-                conn.commit()
-    except Exception as e:
-        app.logger.error(f"Database error: {e}")
+    # Store observation (written asynchronously in batches)
+    parsed = parse_ja4(ja4)
+    record_observation((
+        ja4, parsed['a'], parsed['b'], parsed['c'],
+        source_ip, user_agent,
+        result['total_score'], result['classification'],
+        result['reasons']
+    ))
 
     return jsonify(result)
 
 
+# to_char() pattern matching the RFC 822 dates jsonify emits for datetimes
+HTTP_DATE_FORMAT = 'Dy, DD Mon YYYY HH24:MI:SS "GMT"'
+
+
 @app.route('/fingerprint/<ja4>', methods=['GET'])
 def lookup_fingerprint(ja4: str):
     """
@@ -387,23 +724,41 @@ def lookup_fingerprint(ja4: str):
     """
     with get_db() as conn:
         with conn.cursor() as cur:
-            # Check known fingerprints
+            # Known entry and latest observations in one round trip; the two
+            # tables have different columns, so each side comes back as JSON
+            # (psycopg2 decodes it to dicts). Timestamps are rendered in the
+            # same RFC 822 form jsonify gives datetimes, so the response
+            # format is unchanged.
             cur.execute("""
-                SELECT * FROM known_fingerprints WHERE ja4 = %s
-            """, (ja4,))
-            known = cur.fetchone()
-
-            # Check observed fingerprints
-            cur.execute("""
-                SELECT * FROM observed_fingerprints WHERE ja4 = %s
-                ORDER BY last_seen DESC LIMIT 10
-            """, (ja4,))
-            observations = cur.fetchall()
+                SELECT
+                    (SELECT to_jsonb(k) || jsonb_build_object(
+                                'created_at', to_char(k.created_at, %(http_date)s),
+                                'updated_at', to_char(k.updated_at, %(http_date)s))
+                     FROM known_fingerprints k
+                     WHERE k.ja4 = %(ja4)s LIMIT 1) AS known,
+                    (SELECT COALESCE(json_agg(
+                                to_jsonb(o) || jsonb_build_object(
+                                    'first_seen', to_char(o.first_seen, %(http_date)s),
+                                    'last_seen', to_char(o.last_seen, %(http_date)s))
+                                ORDER BY o.last_seen DESC), '[]'::json)
+                     FROM (SELECT * FROM observed_fingerprints WHERE ja4 = %(ja4)s
+                           ORDER BY last_seen DESC LIMIT 10) o) AS observations
+            """, {'ja4': ja4, 'http_date': HTTP_DATE_FORMAT})
+            row = cur.fetchone()
+
+    # JSON drops the fraction from whole FLOAT values (1.0 comes back as 1)
+    known = row['known']
+    if known and known['confidence'] is not None:
+        known['confidence'] = float(known['confidence'])
+    observations = row['observations']
+    for o in observations:
+        if o['anomaly_score'] is not None:
+            o['anomaly_score'] = float(o['anomaly_score'])
 
     return jsonify({
         'ja4': ja4,
-        'known': dict(known) if known else None,
-        'observations': [dict(o) for o in observations],
+        'known': known,
+        'observations': observations,
         'observation_count': len(observations)
     })
 
@@ -413,17 +768,15 @@ def get_stats():
     """Get detection statistics."""
     with get_db() as conn:
         with conn.cursor() as cur:
-            # Total observations
-            cur.execute("SELECT COUNT(*) as count FROM observed_fingerprints")
-            total = cur.fetchone()['count']
-
-            # By classification
+            # Totals come from the trigger-maintained rollup - a handful of
+            # rows, however large observed_fingerprints grows
             cur.execute("""
-                SELECT classification, COUNT(*) as count
-                FROM observed_fingerprints
-                GROUP BY classification
+                SELECT classification, count
+                FROM fingerprint_stats_rollup
+                WHERE count > 0
             """)
             by_class = {row['classification']: row['count'] for row in cur.fetchall()}
+            total = sum(by_class.values())
 
             # Top fingerprints
             cur.execute("""
@@ -463,6 +816,9 @@ def test_evasion():
     if not data or 'ja4' not in data:
         return jsonify({'error': 'ja4 field required'}), 400
 
+    if not is_ja4(data['ja4']):
+        return jsonify({'error': 'Invalid JA4 format'}), 400
+
     result = calculate_combined_score(
         data['ja4'],
         data.get('user_agent', ''),
@@ -490,4 +846,6 @@ def test_evasion():
 
 
 if __name__ == '__main__':
+    # Exit normally on `docker stop` so atexit flushes queued observations
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -10,18 +10,24 @@ Usage:
     python ja4_extractor.py --live eth0
 """
 
+import array
 import hashlib
+import socket
 import struct
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, Optional
 
 # GREASE values (RFC 8701) - must be filtered out
-GREASE_VALUES = {
+GREASE_VALUES = frozenset({
     0x0a0a, 0x1a1a, 0x2a2a, 0x3a3a, 0x4a4a, 0x5a5a,
     0x6a6a, 0x7a7a, 0x8a8a, 0x9a9a, 0xaaaa, 0xbaba,
     0xcaca, 0xdada, 0xeaea, 0xfafa
-}
+})
 
 # TLS version mapping
 TLS_VERSIONS = {
@@ -40,8 +46,13 @@ EXT_ALPN = 0x0010
 EXT_SUPPORTED_VERSIONS = 0x002b
 EXT_SIGNATURE_ALGORITHMS = 0x000d
 
+# Extensions left out of the section C hash: GREASE plus SNI and ALPN
+SECTION_C_EXCLUDED = GREASE_VALUES | {EXT_SNI, EXT_ALPN}
+
 
-@dataclass
+# slots: one of each is built per packet, and worker processes pickle the
+# fingerprints back to the parent
+@dataclass(slots=True)
 class ClientHello:
     """Parsed TLS ClientHello message."""
     version: int
@@ -61,7 +72,7 @@ class ClientHello:
             self.signature_algorithms = []
 
 
-@dataclass
+@dataclass(slots=True)
 class JA4Fingerprint:
     """JA4 fingerprint with all components."""
     full: str
@@ -83,6 +94,10 @@ def get_tls_version_string(version: int) -> str:
     return TLS_VERSIONS.get(version, "00")
 
 
+# ASCII bytes that str.isalnum() rejects, for bytes.translate(None, delete=...)
+_ASCII_NON_ALNUM = bytes(b for b in range(128) if not chr(b).isalnum())
+
+
 def get_alpn_code(alpn_protocols: list[str]) -> str:
     """
     Extract ALPN code (first and last alphanumeric char).
@@ -96,7 +111,11 @@ def get_alpn_code(alpn_protocols: list[str]) -> str:
         return "00"
 
     first_proto = alpn_protocols[0]
-    alphanumeric = ''.join(c for c in first_proto if c.isalnum())
+    if first_proto.isascii():
+        # Usual case - strip non-alphanumerics in one C call
+        alphanumeric = first_proto.encode('ascii').translate(None, _ASCII_NON_ALNUM).decode('ascii')
+    else:
+        alphanumeric = ''.join(c for c in first_proto if c.isalnum())
 
     if len(alphanumeric) >= 2:
         return alphanumeric[0] + alphanumeric[-1]
@@ -106,9 +125,69 @@ def get_alpn_code(alpn_protocols: list[str]) -> str:
         return "00"
 
 
-def compute_hash(data: str) -> str:
+def compute_hash(data: str | bytes) -> str:
     """Compute truncated SHA256 hash (12 chars)."""
-    return hashlib.sha256(data.encode()).hexdigest()[:12]
+    if isinstance(data, str):
+        data = data.encode()
+    # 6 digest bytes = 12 hex chars, without formatting the full 64-char hexdigest
+    return hashlib.sha256(data).digest()[:6].hex()
+
+
+def hex_list(values) -> bytes:
+    """Format values as comma-separated 4-digit hex, e.g. b"1301,1302"."""
+    # Pack as big-endian uint16 and let bytes.hex() insert a comma every
+    # 2 bytes - the whole conversion runs in C, no per-value objects
+    packed = array.array('H', values)
+    if sys.byteorder == 'little':
+        packed.byteswap()
+    return packed.tobytes().hex(',', 2).encode()
+
+
+# JA4 uses all zeros rather than a digest when a section has nothing to hash
+EMPTY_HASH = "000000000000"
+
+# Sections B and C only depend on the cipher/extension lists, and a capture
+# usually holds many ClientHellos from the same few client builds, so the
+# filter-sort-hash work is cached per distinct list.
+
+@lru_cache(maxsize=1024)
+def cipher_section(cipher_suites: tuple[int, ...]) -> tuple[int, str]:
+    """Section B: non-GREASE cipher count and hash of the sorted ciphers."""
+    ciphers = [c for c in cipher_suites if c not in GREASE_VALUES]
+    # Sort ciphers (JA4 normalizes by sorting)
+    ciphers.sort()
+    if not ciphers:
+        return 0, EMPTY_HASH
+    return len(ciphers), compute_hash(hex_list(ciphers))
+
+
+@lru_cache(maxsize=1024)
+def extension_section(extensions: tuple[int, ...], signature_algorithms: tuple[int, ...]) -> tuple[int, str]:
+    """Section C: non-GREASE extension count and hash of the sorted extensions
+    plus signature algorithms."""
+    # The count still includes SNI and ALPN
+    ext_count = sum(1 for e in extensions if e not in GREASE_VALUES)
+
+    # Filter out GREASE, SNI (0x0000) and ALPN (0x0010), then sort
+    extensions_sorted = sorted(e for e in extensions if e not in SECTION_C_EXCLUDED)
+    if not extensions_sorted and not signature_algorithms:
+        return ext_count, EMPTY_HASH
+    ext_string = hex_list(extensions_sorted)
+
+    # Append signature algorithms (NOT sorted, original order)
+    if signature_algorithms:
+        return ext_count, compute_hash(ext_string + b"_" + hex_list(signature_algorithms))
+    return ext_count, compute_hash(ext_string)
+
+
+@lru_cache(maxsize=4096)
+def build_section_a(version: int, has_sni: bool, cipher_count: int, ext_count: int, alpn_code: str) -> str:
+    """Section A: protocol, TLS version, SNI flag, counts and ALPN code."""
+    # Only a few thousand combinations show up in real traffic, so each
+    # section A string is formatted once and then shared between packets.
+    # "t" = TLS over TCP; SNI present -> "d" (domain), absent -> "i" (IP)
+    sni_char = "d" if has_sni else "i"
+    return f"t{get_tls_version_string(version)}{sni_char}{cipher_count:02d}{ext_count:02d}{alpn_code}"
 
 
 def calculate_ja4(client_hello: ClientHello) -> JA4Fingerprint:
@@ -125,67 +204,29 @@ def calculate_ja4(client_hello: ClientHello) -> JA4Fingerprint:
     # Section A: Readable metadata
     # ========================================
 
-    # Protocol (t = TLS over TCP)
-    protocol = "t"
-
     # TLS Version (use highest supported if available)
     if client_hello.supported_versions:
         # Filter GREASE and get highest
-        real_versions = [v for v in client_hello.supported_versions if not is_grease(v)]
+        real_versions = [v for v in client_hello.supported_versions if v not in GREASE_VALUES]
         version = max(real_versions) if real_versions else client_hello.version
     else:
         version = client_hello.version
 
-    version_str = get_tls_version_string(version)
-
-    # SNI presence
-    sni_char = "d" if client_hello.sni else "i"
-
-    # Cipher count (excluding GREASE)
-    real_ciphers = [c for c in client_hello.cipher_suites if not is_grease(c)]
-    cipher_count = min(len(real_ciphers), 99)
-
-    # Extension count (excluding GREASE)
-    real_extensions = [e for e in client_hello.extensions if not is_grease(e)]
-    ext_count = min(len(real_extensions), 99)
+    # Cipher and extension counts (excluding GREASE) come from the cached
+    # section B/C helpers, so repeat ClientHellos skip the filtering entirely
+    cipher_count, section_b = cipher_section(tuple(client_hello.cipher_suites))
+    ext_count, section_c = extension_section(
+        tuple(client_hello.extensions),
+        tuple(client_hello.signature_algorithms)
+    )
+    cipher_count = min(cipher_count, 99)
+    ext_count = min(ext_count, 99)
 
     # ALPN code
     alpn_code = get_alpn_code(client_hello.alpn_protocols)
 
     # Build section A
-    section_a = f"{protocol}{version_str}{sni_char}{cipher_count:02d}{ext_count:02d}{alpn_code}"
-
-    # ========================================
-    # Section B: Cipher hash
-    # ========================================
-
-    # Sort ciphers (JA4 normalizes by sorting)
-    ciphers_sorted = sorted(real_ciphers)
-    cipher_string = ",".join(f"{c:04x}" for c in ciphers_sorted)
-    section_b = compute_hash(cipher_string)
-
-    # ========================================
-    # Section C: Extension hash
-    # ========================================
-
-    # Filter out SNI (0x0000) and ALPN (0x0010) from extensions
-    extensions_filtered = [
-        e for e in real_extensions
-        if e not in (EXT_SNI, EXT_ALPN)
-    ]
-
-    # Sort extensions
-    extensions_sorted = sorted(extensions_filtered)
-    ext_string = ",".join(f"{e:04x}" for e in extensions_sorted)
-
-    # Append signature algorithms (NOT sorted, original order)
-    if client_hello.signature_algorithms:
-        sig_string = ",".join(f"{s:04x}" for s in client_hello.signature_algorithms)
-        combined = f"{ext_string}_{sig_string}"
-    else:
-        combined = ext_string
-
-    section_c = compute_hash(combined)
+    section_a = build_section_a(version, bool(client_hello.sni), cipher_count, ext_count, alpn_code)
 
     # ========================================
     # Build final fingerprint
@@ -201,6 +242,18 @@ def calculate_ja4(client_hello: ClientHello) -> JA4Fingerprint:
     )
 
 
+def unpack_u16_list(data: bytes) -> list[int]:
+    """Decode a block of big-endian uint16 values in one call.
+
+    A trailing odd byte (truncated capture) is ignored.
+    """
+    values = array.array('H')
+    values.frombytes(data[:len(data) & ~1])
+    if sys.byteorder == 'little':
+        values.byteswap()
+    return values.tolist()
+
+
 def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
     """
     Parse raw TLS ClientHello bytes.
@@ -209,6 +262,8 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
     Production code should use a proper TLS parsing library.
     """
     try:
+        # Every sub-slice below is a view into data, not a copy
+        data = memoryview(data)
         offset = 0
 
         # TLS Record Header (5 bytes)
@@ -216,8 +271,8 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
         if content_type != 0x16:  # Handshake
             return None
 
-        record_version = struct.unpack(">H", data[offset+1:offset+3])[0]
-        record_length = struct.unpack(">H", data[offset+3:offset+5])[0]
+        record_version = struct.unpack_from(">H", data, offset+1)[0]
+        record_length = struct.unpack_from(">H", data, offset+3)[0]
         offset += 5
 
         # Handshake Header (4 bytes)
@@ -225,11 +280,11 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
         if handshake_type != 0x01:  # ClientHello
             return None
 
-        handshake_length = struct.unpack(">I", b'\x00' + data[offset+1:offset+4])[0]
+        handshake_length = struct.unpack_from(">I", data, offset)[0] & 0xFFFFFF
         offset += 4
 
         # ClientHello fields
-        client_version = struct.unpack(">H", data[offset:offset+2])[0]
+        client_version = struct.unpack_from(">H", data, offset)[0]
         offset += 2
 
         # Random (32 bytes)
@@ -240,13 +295,13 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
         offset += 1 + session_id_len
 
         # Cipher Suites
-        cipher_suites_len = struct.unpack(">H", data[offset:offset+2])[0]
+        cipher_suites_len = struct.unpack_from(">H", data, offset)[0]
         offset += 2
 
-        cipher_suites = []
-        for i in range(0, cipher_suites_len, 2):
-            cipher = struct.unpack(">H", data[offset+i:offset+i+2])[0]
-            cipher_suites.append(cipher)
+        cipher_block = data[offset:offset+cipher_suites_len]
+        if len(cipher_block) != cipher_suites_len or cipher_suites_len % 2:
+            raise ValueError("truncated cipher suite list")
+        cipher_suites = unpack_u16_list(cipher_block)
         offset += cipher_suites_len
 
         # Compression Methods
@@ -261,13 +316,13 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
         signature_algorithms = []
 
         if offset < len(data):
-            extensions_len = struct.unpack(">H", data[offset:offset+2])[0]
+            extensions_len = struct.unpack_from(">H", data, offset)[0]
             offset += 2
 
             ext_end = offset + extensions_len
             while offset < ext_end:
-                ext_type = struct.unpack(">H", data[offset:offset+2])[0]
-                ext_len = struct.unpack(">H", data[offset+2:offset+4])[0]
+                ext_type = struct.unpack_from(">H", data, offset)[0]
+                ext_len = struct.unpack_from(">H", data, offset+2)[0]
                 ext_data = data[offset+4:offset+4+ext_len]
 
                 extensions.append(ext_type)
@@ -276,21 +331,21 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
                 if ext_type == EXT_SNI and ext_len > 0:
                     # SNI extension
                     try:
-                        sni_list_len = struct.unpack(">H", ext_data[0:2])[0]
+                        sni_list_len = struct.unpack_from(">H", ext_data)[0]
                         sni_type = ext_data[2]
-                        sni_len = struct.unpack(">H", ext_data[3:5])[0]
-                        sni = ext_data[5:5+sni_len].decode('utf-8')
+                        sni_len = struct.unpack_from(">H", ext_data, 3)[0]
+                        sni = str(ext_data[5:5+sni_len], 'utf-8')
                     except Exception:
                         pass
 
                 elif ext_type == EXT_ALPN and ext_len > 0:
                     # ALPN extension
                     try:
-                        alpn_list_len = struct.unpack(">H", ext_data[0:2])[0]
+                        alpn_list_len = struct.unpack_from(">H", ext_data)[0]
                         alpn_offset = 2
                         while alpn_offset < 2 + alpn_list_len:
                             proto_len = ext_data[alpn_offset]
-                            proto = ext_data[alpn_offset+1:alpn_offset+1+proto_len].decode('utf-8')
+                            proto = str(ext_data[alpn_offset+1:alpn_offset+1+proto_len], 'utf-8')
                             alpn_protocols.append(proto)
                             alpn_offset += 1 + proto_len
                     except Exception:
@@ -300,19 +355,15 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
                     # Supported versions extension
                     try:
                         ver_list_len = ext_data[0]
-                        for i in range(0, ver_list_len, 2):
-                            ver = struct.unpack(">H", ext_data[1+i:3+i])[0]
-                            supported_versions.append(ver)
+                        supported_versions = unpack_u16_list(ext_data[1:1+ver_list_len])
                     except Exception:
                         pass
 
                 elif ext_type == EXT_SIGNATURE_ALGORITHMS and ext_len > 0:
                     # Signature algorithms extension
                     try:
-                        sig_list_len = struct.unpack(">H", ext_data[0:2])[0]
-                        for i in range(0, sig_list_len, 2):
-                            sig = struct.unpack(">H", ext_data[2+i:4+i])[0]
-                            signature_algorithms.append(sig)
+                        sig_list_len = struct.unpack_from(">H", ext_data)[0]
+                        signature_algorithms = unpack_u16_list(ext_data[2:2+sig_list_len])
                     except Exception:
                         pass
 
@@ -333,80 +384,262 @@ def parse_client_hello_raw(data: bytes) -> Optional[ClientHello]:
         return None
 
 
-def extract_from_pcap(pcap_path: str) -> list[tuple[str, JA4Fingerprint]]:
+# Classic libpcap file magic -> struct byte order (microsecond and
+# nanosecond timestamp variants). pcapng and anything else goes to scapy.
+PCAP_BYTE_ORDER = {
+    b'\xd4\xc3\xb2\xa1': '<', b'\xa1\xb2\xc3\xd4': '>',
+    b'\x4d\x3c\xb2\xa1': '<', b'\xa1\xb2\x3c\x4d': '>',
+}
+
+# Link types the raw reader understands
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = 101
+LINKTYPE_LINUX_SLL = 113
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86dd
+ETHERTYPE_VLAN = 0x8100
+IPPROTO_TCP = 6
+
+
+def iter_pcap_frames(pcap_file, byte_order: str) -> Iterator[tuple[int, bytes]]:
+    """Yield (link_type, frame) from a classic pcap file positioned after the magic."""
+    header = pcap_file.read(20)
+    if len(header) < 20:
+        return
+    link_type = struct.unpack(byte_order + "HHiIII", header)[5] & 0x0fffffff
+    record = struct.Struct(byte_order + "IIII")
+
+    while True:
+        record_header = pcap_file.read(16)
+        if len(record_header) < 16:
+            return
+        captured_len = record.unpack(record_header)[2]
+        frame = pcap_file.read(captured_len)
+        if len(frame) < captured_len:
+            return
+        yield link_type, frame
+
+
+def tcp_payload(link_type: int, frame: bytes) -> Optional[tuple[str, bytes]]:
+    """Return (source_ip, TCP payload) for an IPv4/IPv6 TCP frame, else None."""
+    # Link layer -> IP packet
+    if link_type == LINKTYPE_ETHERNET:
+        ethertype = struct.unpack(">H", frame[12:14])[0]
+        offset = 14
+        if ethertype == ETHERTYPE_VLAN:
+            ethertype = struct.unpack(">H", frame[16:18])[0]
+            offset = 18
+        if ethertype not in (ETHERTYPE_IPV4, ETHERTYPE_IPV6):
+            return None
+        packet = frame[offset:]
+    elif link_type == LINKTYPE_LINUX_SLL:
+        packet = frame[16:]
+    elif link_type == LINKTYPE_NULL:
+        packet = frame[4:]
+    elif link_type == LINKTYPE_RAW:
+        packet = frame
+    else:
+        return None
+
+    if len(packet) < 20:
+        return None
+
+    # IP layer -> TCP segment (fragments and IPv6 extension headers are skipped)
+    version = packet[0] >> 4
+    if version == 4:
+        header_len = (packet[0] & 0x0f) * 4
+        total_len = struct.unpack(">H", packet[2:4])[0]
+        fragment = struct.unpack(">H", packet[6:8])[0] & 0x3fff
+        if packet[9] != IPPROTO_TCP or fragment:
+            return None
+        source_ip = socket.inet_ntop(socket.AF_INET, packet[12:16])
+        segment = packet[header_len:total_len]
+    elif version == 6 and len(packet) >= 40:
+        if packet[6] != IPPROTO_TCP:
+            return None
+        payload_len = struct.unpack(">H", packet[4:6])[0]
+        source_ip = socket.inet_ntop(socket.AF_INET6, packet[8:24])
+        segment = packet[40:40 + payload_len]
+    else:
+        return None
+
+    if len(segment) < 20:
+        return None
+    return source_ip, segment[(segment[12] >> 4) * 4:]
+
+
+# ClientHellos sent to each worker at a time - large enough that pickling
+# and IPC are small next to the parse + hash work
+PARALLEL_CHUNKSIZE = 256
+
+# Chunks queued per worker; caps how far reading runs ahead of the results
+PARALLEL_CHUNKS_PER_WORKER = 2
+
+
+def iter_client_hello_records(pcap_file, byte_order: str) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield (source_ip, TLS record) for each ClientHello in a classic pcap file.
+
+    Headers are unpacked with struct, without scapy's per-packet layer
+    dissection. Only records complete within one segment are returned.
+    """
+    for link_type, frame in iter_pcap_frames(pcap_file, byte_order):
+        try:
+            found = tcp_payload(link_type, frame)
+        except (struct.error, IndexError, ValueError):
+            continue  # Truncated or malformed frame
+        if found is None:
+            continue
+        source_ip, payload = found
+
+        # Handshake record carrying a ClientHello, complete in this segment
+        if len(payload) < 6 or payload[0] != 0x16 or payload[5] != 0x01:
+            continue
+        if len(payload) < 5 + struct.unpack(">H", payload[3:5])[0]:
+            continue
+
+        yield source_ip, payload
+
+
+def fingerprint_record(record: tuple[str, bytes]) -> Optional[tuple[str, JA4Fingerprint]]:
+    """Parse one (source_ip, TLS record) and fingerprint it; None if unparseable."""
+    source_ip, payload = record
+    client_hello = parse_client_hello_raw(payload)
+    if client_hello is None:
+        return None
+    return source_ip, calculate_ja4(client_hello)
+
+
+def fingerprint_records(records: list) -> list[tuple[str, JA4Fingerprint]]:
+    """Fingerprint a chunk of records in a worker, dropping unparseable ones."""
+    return [result for result in map(fingerprint_record, records) if result is not None]
+
+
+def extract_from_pcap_raw(pcap_file, byte_order: str, workers: int = 1) -> Iterator[tuple[str, JA4Fingerprint]]:
+    """
+    Fast path for classic pcap files.
+
+    With workers > 1, parsing and hashing are spread over a process pool
+    while this process keeps reading the file; results stay in capture order.
+    """
+    records = iter_client_hello_records(pcap_file, byte_order)
+    if workers > 1:
+        # Submit chunk by chunk with a bounded queue (executor.map would
+        # read the whole capture up front), so memory stays flat
+        max_pending = workers * PARALLEL_CHUNKS_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in iter(lambda: list(islice(records, PARALLEL_CHUNKSIZE)), []):
+                pending.append(executor.submit(fingerprint_records, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+    else:
+        for record in records:
+            result = fingerprint_record(record)
+            if result is not None:
+                yield result
+
+
+def extract_from_pcap(pcap_path: str, workers: int = 1) -> Iterator[tuple[str, JA4Fingerprint]]:
     """
     Extract JA4 fingerprints from a pcap file.
 
-    Returns list of (source_ip, fingerprint) tuples.
+    Yields (source_ip, fingerprint) tuples as ClientHellos are found.
+    Classic pcap files are parsed directly, using up to `workers` processes;
+    other formats (pcapng) use scapy in this process.
+    """
+    with open(pcap_path, 'rb') as pcap_file:
+        byte_order = PCAP_BYTE_ORDER.get(pcap_file.read(4))
+        if byte_order is not None:
+            yield from extract_from_pcap_raw(pcap_file, byte_order, workers)
+            return
+
+    yield from extract_from_pcap_scapy(pcap_path)
+
+
+def extract_from_pcap_scapy(pcap_path: str) -> Iterator[tuple[str, JA4Fingerprint]]:
+    """
+    Extract JA4 fingerprints from any capture format scapy can read.
+
+    Yields (source_ip, fingerprint) tuples as ClientHellos are found.
     """
     try:
-        from scapy.all import rdpcap, TCP, IP
+        from scapy.all import PcapReader, TCP, IP
         from scapy.layers.tls.handshake import TLSClientHello
         from scapy.layers.tls.record import TLS
     except ImportError:
         print("Error: scapy is required. Install with: pip install scapy", file=sys.stderr)
-        return []
-
-    results = []
-    packets = rdpcap(pcap_path)
-
-    for pkt in packets:
-        if pkt.haslayer(TLS) and pkt.haslayer(TLSClientHello):
-            try:
-                tls = pkt[TLS]
-                ch = pkt[TLSClientHello]
-
-                # Extract fields using scapy
-                client_hello = ClientHello(
-                    version=ch.version,
-                    cipher_suites=list(ch.ciphers) if ch.ciphers else [],
-                    extensions=[e.type for e in ch.ext] if ch.ext else [],
-                    sni=None,
-                    alpn_protocols=[],
-                    supported_versions=[],
-                    signature_algorithms=[]
-                )
-
-                # Parse extensions
-                if ch.ext:
-                    for ext in ch.ext:
-                        if ext.type == EXT_SNI:
+        return
+
+    # Stream packets instead of loading the whole capture with rdpcap();
+    # only ClientHellos are kept, so memory stays flat on large pcaps
+    with PcapReader(pcap_path) as packets:
+        for pkt in packets:
+            if pkt.haslayer(TLS) and pkt.haslayer(TLSClientHello):
+                try:
+                    ch = pkt[TLSClientHello]
+
+                    # Collect extension types and parse the ones JA4 needs
+                    # in a single pass over scapy's (slow) extension objects
+                    extensions = []
+                    sni = None
+                    alpn_protocols = []
+                    supported_versions = []
+                    signature_algorithms = []
+
+                    for ext in ch.ext or []:
+                        ext_type = ext.type
+                        extensions.append(ext_type)
+                        if ext_type == EXT_SNI:
                             try:
-                                client_hello.sni = ext.servernames[0].servername.decode()
+                                sni = ext.servernames[0].servername.decode()
                             except Exception:
                                 pass
-                        elif ext.type == EXT_ALPN:
+                        elif ext_type == EXT_ALPN:
                             try:
-                                client_hello.alpn_protocols = [
-                                    p.decode() for p in ext.protocols
-                                ]
+                                alpn_protocols = [p.decode() for p in ext.protocols]
                             except Exception:
                                 pass
-                        elif ext.type == EXT_SUPPORTED_VERSIONS:
+                        elif ext_type == EXT_SUPPORTED_VERSIONS:
                             try:
-                                client_hello.supported_versions = list(ext.versions)
+                                supported_versions = list(ext.versions)
                             except Exception:
                                 pass
-                        elif ext.type == EXT_SIGNATURE_ALGORITHMS:
+                        elif ext_type == EXT_SIGNATURE_ALGORITHMS:
                             try:
-                                client_hello.signature_algorithms = list(ext.sig_algs)
+                                signature_algorithms = list(ext.sig_algs)
                             except Exception:
                                 pass
 
-                ja4 = calculate_ja4(client_hello)
-                source_ip = pkt[IP].src if pkt.haslayer(IP) else "unknown"
-                results.append((source_ip, ja4))
+                    # Extract fields using scapy
+                    client_hello = ClientHello(
+                        version=ch.version,
+                        cipher_suites=list(ch.ciphers) if ch.ciphers else [],
+                        extensions=extensions,
+                        sni=sni,
+                        alpn_protocols=alpn_protocols,
+                        supported_versions=supported_versions,
+                        signature_algorithms=signature_algorithms
+                    )
 
-            except Exception as e:
-                print(f"Error processing packet: {e}", file=sys.stderr)
+                    ja4 = calculate_ja4(client_hello)
+                    source_ip = pkt[IP].src if pkt.haslayer(IP) else "unknown"
 
-    return results
+                except Exception as e:
+                    print(f"Error processing packet: {e}", file=sys.stderr)
+                    continue
+
+                yield source_ip, ja4
 
 
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
-        print("Usage: python ja4_extractor.py <pcap_file>")
+        print("Usage: python ja4_extractor.py <pcap_file> [--jobs N]")
         print("       python ja4_extractor.py --live <interface>")
         sys.exit(1)
 
@@ -419,12 +652,22 @@ def main():
         sys.exit(0)
 
     pcap_path = sys.argv[1]
+
+    # --jobs N parses with N worker processes (worth it for large captures)
+    workers = 1
+    if "--jobs" in sys.argv[2:]:
+        try:
+            workers = int(sys.argv[sys.argv.index("--jobs") + 1])
+        except (IndexError, ValueError):
+            print("Error: --jobs requires a number")
+            sys.exit(1)
+
     print(f"Extracting JA4 fingerprints from: {pcap_path}")
     print("-" * 60)
 
-    results = extract_from_pcap(pcap_path)
-
-    for source_ip, ja4 in results:
+    # Print each fingerprint as soon as it's extracted
+    total = 0
+    for total, (source_ip, ja4) in enumerate(extract_from_pcap(pcap_path, workers), 1):
         print(f"Source: {source_ip}")
         print(f"  JA4:   {ja4.full}")
         print(f"  JA4_a: {ja4.a}")
@@ -432,7 +675,7 @@ def main():
         print(f"  JA4_c: {ja4.c}")
         print()
 
-    print(f"Total fingerprints extracted: {len(results)}")
+    print(f"Total fingerprints extracted: {total}")
 
 
 if __name__ == "__main__":
@@ -7,13 +7,23 @@ Run student implementations against test cases and generate grades.
 Usage:
     python test_harness.py --assignment 1 --submission ./student_code.py
     python test_harness.py --assignment 3 --submission ./detector.py --verbose
+    python test_harness.py --assignment 1 --batch ./submissions/ -o grades.json
+        (one directory per student: ./submissions/<student>/submission.py)
+    python test_harness.py --assignment all --submission ./student_code.py
 """
 
 import argparse
+import contextlib
 import importlib.util
+import io
 import json
+import multiprocessing
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Callable, List, Dict, Any
 
 # ============================================
@@ -118,7 +128,7 @@ ANOMALY_TEST_CASES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     name: str
     passed: bool
@@ -127,8 +137,34 @@ class TestResult:
     message: str
 
 
+@dataclass
+class ClientHello:
+    """ClientHello for submissions that don't define their own."""
+    version: int
+    cipher_suites: list
+    extensions: list
+    sni: str = None
+    alpn_protocols: list = None
+    signature_algorithms: list = None
+
+
+# "00".."99" -> int, for the count fields in JA4_a
+TWO_DIGIT = {f"{i:02d}": i for i in range(100)}
+
+
+def parse_count(field: str) -> int:
+    """Parse a two-digit JA4_a count, falling back to int() for odd output."""
+    count = TWO_DIGIT.get(field)
+    return int(field) if count is None else count
+
+
 def load_student_module(path: str):
     """Dynamically load student's Python module."""
+    # Let the submission import helper modules that sit next to it
+    submission_dir = os.path.dirname(os.path.abspath(path))
+    if submission_dir not in sys.path:
+        sys.path.insert(0, submission_dir)
+
     spec = importlib.util.spec_from_file_location("student_module", path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
@@ -152,24 +188,17 @@ def run_ja4_tests(module, verbose: bool = False) -> List[TestResult]:
             ))
             return results
 
-    # Create ClientHello class if not in module
+    # Provide the default ClientHello if the module doesn't define one
     if not hasattr(module, 'ClientHello'):
-        from dataclasses import dataclass
-        @dataclass
-        class ClientHello:
-            version: int
-            cipher_suites: list
-            extensions: list
-            sni: str = None
-            alpn_protocols: list = None
-            signature_algorithms: list = None
         module.ClientHello = ClientHello
+    client_hello_cls = module.ClientHello
+    calculate_ja4 = module.calculate_ja4
 
     for test in JA4_TEST_CASES:
         try:
             # Create ClientHello from test input
-            ch = module.ClientHello(**test['input'])
-            result = module.calculate_ja4(ch)
+            ch = client_hello_cls(**test['input'])
+            result = calculate_ja4(ch)
 
             passed = True
             messages = []
@@ -188,13 +217,13 @@ def run_ja4_tests(module, verbose: bool = False) -> List[TestResult]:
 
             if 'expected_cipher_count' in test:
                 # Extract cipher count from JA4_a (positions 4-5)
-                cipher_count = int(result.a[4:6])
+                cipher_count = parse_count(result.a[4:6])
                 if cipher_count != test['expected_cipher_count']:
                     passed = False
                     messages.append(f"Cipher count should be {test['expected_cipher_count']}, got {cipher_count}")
 
             if 'expected_ext_count' in test:
-                ext_count = int(result.a[6:8])
+                ext_count = parse_count(result.a[6:8])
                 if ext_count != test['expected_ext_count']:
                     passed = False
                     messages.append(f"Extension count should be {test['expected_ext_count']}, got {ext_count}")
@@ -204,12 +233,13 @@ def run_ja4_tests(module, verbose: bool = False) -> List[TestResult]:
                 passed = False
                 messages.append("JA4 format invalid (should be a_b_c)")
 
+            message = "; ".join(messages) if messages else "OK"
             results.append(TestResult(
                 name=test['name'],
                 passed=passed,
                 points_earned=test['points'] if passed else 0,
                 points_possible=test['points'],
-                message="; ".join(messages) if messages else "OK"
+                message=message
             ))
 
             if verbose:
@@ -217,7 +247,7 @@ def run_ja4_tests(module, verbose: bool = False) -> List[TestResult]:
                 print(f"    Result: {result.full}")
                 print(f"    Passed: {passed}")
                 if messages:
-                    print(f"    Issues: {'; '.join(messages)}")
+                    print(f"    Issues: {message}")
 
         except Exception as e:
             results.append(TestResult(
@@ -246,9 +276,11 @@ def run_anomaly_tests(module, verbose: bool = False) -> List[TestResult]:
         ))
         return results
 
+    detect_anomaly = module.detect_anomaly
+
     for test in ANOMALY_TEST_CASES:
         try:
-            result = module.detect_anomaly(**test['input'])
+            result = detect_anomaly(**test['input'])
 
             passed = True
             messages = []
@@ -300,31 +332,33 @@ def run_anomaly_tests(module, verbose: bool = False) -> List[TestResult]:
     return results
 
 
-def print_report(results: List[TestResult], assignment: int):
+def print_report(results: List[TestResult], assignment):
     """Print grading report."""
-    print()
-    print("=" * 60)
-    print(f"GRADING REPORT - Assignment {assignment}")
-    print("=" * 60)
-    print()
+    # Collected and written in one go rather than a print() per line
+    lines = []
+    lines.append("")
+    lines.append("=" * 60)
+    lines.append(f"GRADING REPORT - Assignment {assignment}")
+    lines.append("=" * 60)
+    lines.append("")
 
     total_earned = 0
     total_possible = 0
 
     for r in results:
         status = "PASS" if r.passed else "FAIL"
-        print(f"[{status}] {r.name}")
-        print(f"       Points: {r.points_earned:.1f}/{r.points_possible:.1f}")
+        lines.append(f"[{status}] {r.name}")
+        lines.append(f"       Points: {r.points_earned:.1f}/{r.points_possible:.1f}")
         if r.message != "OK":
-            print(f"       Note: {r.message}")
-        print()
+            lines.append(f"       Note: {r.message}")
+        lines.append("")
 
         total_earned += r.points_earned
         total_possible += r.points_possible
 
-    print("-" * 60)
+    lines.append("-" * 60)
     percentage = (total_earned / total_possible * 100) if total_possible > 0 else 0
-    print(f"TOTAL: {total_earned:.1f}/{total_possible:.1f} ({percentage:.1f}%)")
+    lines.append(f"TOTAL: {total_earned:.1f}/{total_possible:.1f} ({percentage:.1f}%)")
 
     # Letter grade
     if percentage >= 90:
@@ -338,16 +372,101 @@ def print_report(results: List[TestResult], assignment: int):
     else:
         grade = "F"
 
-    print(f"GRADE: {grade}")
-    print("=" * 60)
+    lines.append(f"GRADE: {grade}")
+    lines.append("=" * 60)
+    print("\n".join(lines))
+
+
+def results_to_json(results: List[TestResult]) -> Dict[str, Any]:
+    """Serializable form of one submission's results."""
+    return {
+        "results": [
+            {
+                "name": r.name,
+                "passed": r.passed,
+                "points_earned": r.points_earned,
+                "points_possible": r.points_possible,
+                "message": r.message
+            }
+            for r in results
+        ],
+        "total_earned": sum(r.points_earned for r in results),
+        "total_possible": sum(r.points_possible for r in results)
+    }
+
+
+TEST_RUNNERS = {
+    1: run_ja4_tests,
+    3: run_anomaly_tests,
+}
+
+
+def assignment_arg(value: str):
+    """--assignment value: an assignment number, or 'all'."""
+    if value == "all":
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number or 'all', got {value!r}")
+
+
+def run_tests(module, assignment, verbose: bool = False) -> List[TestResult]:
+    """Run one assignment's tests, or every suite against the same loaded module for 'all'."""
+    if assignment == "all":
+        results = []
+        for runner in TEST_RUNNERS.values():
+            results += runner(module, verbose)
+        return results
+    return TEST_RUNNERS[assignment](module, verbose)
+
+
+def describe_error(e: BaseException) -> str:
+    """Message for an exception raised by student code."""
+    if isinstance(e, SystemExit):
+        return f"submission called exit({e.code!r})"
+    return str(e)
+
+
+def grade_submission(path: str, assignment, verbose: bool = False):
+    """
+    Load and grade one submission (runs in a worker process for --batch).
+
+    Returns (results, output) - results is None if the file failed to load,
+    and output is everything the grading printed, so reports from parallel
+    workers don't interleave.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        # SystemExit too - a submission calling exit() mustn't take the
+        # grader down with it
+        try:
+            module = load_student_module(path)
+        except (Exception, SystemExit) as e:
+            print(f"Error loading submission: {describe_error(e)}")
+            return None, output.getvalue()
+
+        try:
+            results = run_tests(module, assignment, verbose)
+        except (Exception, SystemExit) as e:
+            print(f"Error running tests: {describe_error(e)}")
+            return None, output.getvalue()
+        print_report(results, assignment)
+    return results, output.getvalue()
 
 
 def main():
     parser = argparse.ArgumentParser(description="Grade student submissions")
-    parser.add_argument("--assignment", type=int, required=True,
-                        help="Assignment number (1, 3, etc.)")
-    parser.add_argument("--submission", required=True,
+    parser.add_argument("--assignment", type=assignment_arg, required=True,
+                        help="Assignment number (1, 3, etc.), or 'all' to run every suite")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--submission",
                         help="Path to student's Python file")
+    source.add_argument("--batch", metavar="DIR",
+                        help="Grade every DIR/<student>/ENTRY in parallel")
+    parser.add_argument("--entry", default="submission.py",
+                        help="Submission file name inside each --batch student "
+                             "directory (default: submission.py)")
     parser.add_argument("--verbose", "-v", action="store_true",
                         help="Show detailed output")
     parser.add_argument("--output", "-o",
@@ -355,20 +474,22 @@ def main():
 
     args = parser.parse_args()
 
+    if args.assignment != "all" and args.assignment not in TEST_RUNNERS:
+        print(f"Unknown assignment: {args.assignment}")
+        sys.exit(1)
+
+    if args.batch:
+        run_batch(args)
+        return
+
     print(f"Loading submission: {args.submission}")
     try:
         module = load_student_module(args.submission)
-    except Exception as e:
-        print(f"Error loading submission: {e}")
+    except (Exception, SystemExit) as e:
+        print(f"Error loading submission: {describe_error(e)}")
         sys.exit(1)
 
-    if args.assignment == 1:
-        results = run_ja4_tests(module, args.verbose)
-    elif args.assignment == 3:
-        results = run_anomaly_tests(module, args.verbose)
-    else:
-        print(f"Unknown assignment: {args.assignment}")
-        sys.exit(1)
+    results = run_tests(module, args.assignment, args.verbose)
 
     print_report(results, args.assignment)
 
@@ -376,23 +497,82 @@ def main():
         output_data = {
             "assignment": args.assignment,
             "submission": args.submission,
-            "results": [
-                {
-                    "name": r.name,
-                    "passed": r.passed,
-                    "points_earned": r.points_earned,
-                    "points_possible": r.points_possible,
-                    "message": r.message
-                }
-                for r in results
-            ],
-            "total_earned": sum(r.points_earned for r in results),
-            "total_possible": sum(r.points_possible for r in results)
+            **results_to_json(results)
         }
         with open(args.output, 'w') as f:
             json.dump(output_data, f, indent=2)
         print(f"\nResults saved to: {args.output}")
 
 
+def run_batch(args):
+    """Grade every submission in args.batch across a process pool."""
+    # One directory per student, so helper modules sitting next to a
+    # submission aren't graded as submissions themselves
+    paths = sorted(str(p) for p in Path(args.batch).glob(f"*/{args.entry}"))
+    if not paths:
+        print(f"No submissions found in {args.batch} (expected <student>/{args.entry})")
+        sys.exit(1)
+
+    # Submissions are independent and loading them (imports of requests,
+    # curl_cffi, ...) dominates, so they spread well across cores. A fresh
+    # process per submission keeps one student's modules and sys.path
+    # entries away from the next (spawn - fork can't recycle workers).
+    graded = {}
+    with ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        futures = {
+            path: executor.submit(grade_submission, path, args.assignment, args.verbose)
+            for path in paths
+        }
+        for path, future in futures.items():
+            try:
+                graded[path] = future.result()
+            except BrokenProcessPool:
+                # A worker died (os._exit, crash in native code) and took
+                # every unfinished submission with it - regrade those alone
+                pass
+            except Exception as e:
+                graded[path] = None, f"Error grading submission: {e}\n"
+
+    for path in paths:
+        if path not in graded:
+            graded[path] = grade_in_own_process(path, args)
+
+    submissions = []
+    for path in paths:
+        results, output = graded[path]
+        print(f"Loading submission: {path}")
+        print(output, end="")
+        if results is None:
+            submissions.append({"submission": path, "error": output.strip()})
+        else:
+            submissions.append({"submission": path, **results_to_json(results)})
+
+    if args.output:
+        output_data = {
+            "assignment": args.assignment,
+            "submissions": submissions
+        }
+        with open(args.output, 'w') as f:
+            json.dump(output_data, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+
+def grade_in_own_process(path: str, args):
+    """Grade one submission in a single-use worker, reporting it if the worker dies."""
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        try:
+            return executor.submit(
+                grade_submission, path, args.assignment, args.verbose
+            ).result()
+        except BrokenProcessPool:
+            return None, "Error grading submission: worker process exited\n"
+
+
 if __name__ == "__main__":
     main()
@@ -14,10 +14,17 @@ Detection should be trivial - exact JA4 match in database.
 import requests
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor
 
 TARGET_URL = "https://localhost:8443"
 DETECTION_API = "http://localhost:5000"
 
+# The honest python-requests/2.x User-Agent this client sends
+PYTHON_UA = requests.utils.default_user_agent()
+
+# Keep-alive connection to the detection API, reused between calls
+DETECTION_SESSION = requests.Session()
+
 
 def make_requests(count: int = 10):
     """Make requests using default Python requests library."""
@@ -49,6 +56,29 @@ def make_requests(count: int = 10):
             print(f"Request {i+1} failed: {e}")
 
 
+def make_requests_concurrent(count: int = 10):
+    """Send all requests at once - load testing, no pacing between them."""
+
+    print("=" * 60)
+    print("Level 0: Default Python Requests (concurrent)")
+    print("=" * 60)
+    print()
+
+    session = requests.Session()
+
+    def fetch(i):
+        try:
+            response = session.get(TARGET_URL, verify=False, timeout=10)
+            return f"Request {i+1}: {response.status_code}"
+        except Exception as e:
+            return f"Request {i+1} failed: {e}"
+
+    # At most 10 in flight - the size of the session's connection pool
+    with ThreadPoolExecutor(max_workers=min(count, 10)) as executor:
+        for line in executor.map(fetch, range(count)):
+            print(line)
+
+
 def test_detection():
     """Test if the detection API catches this client."""
 
@@ -56,7 +86,7 @@ def test_detection():
     # Actual JA4 depends on Python/OpenSSL version
     test_data = {
         "ja4": "t12d0909h1_3b5aa07d0a1c_cd85d2d7a4b8",  # Example Python JA4
-        "user_agent": requests.utils.default_user_agent(),
+        "user_agent": PYTHON_UA,
         "session_data": {
             "request_times": [time.time() + i * 0.3 for i in range(10)],
             "request_paths": ["/"] * 10
@@ -69,7 +99,7 @@ def test_detection():
     print(f"JA4: {test_data['ja4']}")
 
     try:
-        response = requests.post(
+        response = DETECTION_SESSION.post(
             f"{DETECTION_API}/test-evasion",
             json=test_data
         )
@@ -93,7 +123,10 @@ if __name__ == "__main__":
 
     if "--test-detection" in sys.argv:
         test_detection()
+    elif "--concurrent" in sys.argv:
+        make_requests_concurrent()
     else:
         make_requests()
         print()
         print("Run with --test-detection to test against detection API")
+        print("Run with --concurrent to send the requests all at once")
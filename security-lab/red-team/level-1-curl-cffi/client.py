@@ -14,15 +14,10 @@ Detection hints for students:
 - Missing JavaScript execution artifacts
 """
 
-try:
-    from curl_cffi import requests as curl_requests
-except ImportError:
-    print("curl_cffi not installed. Install with: pip install curl_cffi")
-    print("This is intentional - students should notice the import.")
-    exit(1)
-
+import asyncio
 import time
 import random
+from itertools import accumulate
 
 TARGET_URL = "https://localhost:8443"
 DETECTION_API = "http://localhost:5000"
@@ -35,6 +30,36 @@ CHROME_UA = (
 )
 
 
+# The detection API is scored on the JA4 in the request body, not this
+# connection's own handshake, so plain requests (imported lazily) is enough
+_detection_session = None
+
+
+def detection_session():
+    """Keep-alive session for posting to the detection API."""
+    global _detection_session
+    if _detection_session is None:
+        import requests
+        _detection_session = requests.Session()
+    return _detection_session
+
+
+def import_curl_requests():
+    """
+    Import curl_cffi's requests API.
+
+    Deferred to the functions that send impersonated traffic - curl_cffi
+    loads a native library, and test_detection() doesn't need it.
+    """
+    try:
+        from curl_cffi import requests as curl_requests
+    except ImportError:
+        print("curl_cffi not installed. Install with: pip install curl_cffi")
+        print("This is intentional - students should notice the import.")
+        exit(1)
+    return curl_requests
+
+
 def make_requests(count: int = 10):
     """Make requests impersonating Chrome."""
 
@@ -47,7 +72,7 @@ def make_requests(count: int = 10):
     print()
 
     # Create session with Chrome impersonation
-    session = curl_requests.Session(impersonate="chrome120")
+    session = import_curl_requests().Session(impersonate="chrome120")
 
     for i in range(count):
         try:
@@ -66,19 +91,53 @@ def make_requests(count: int = 10):
             print(f"Request {i+1} failed: {e}")
 
 
+async def fetch_all(count: int) -> list:
+    """Run count impersonated GETs concurrently, returning one line per request."""
+    curl_requests = import_curl_requests()
+    async with curl_requests.AsyncSession(impersonate="chrome120") as session:
+
+        async def fetch(i):
+            try:
+                response = await session.get(
+                    TARGET_URL,
+                    headers={"User-Agent": CHROME_UA},
+                    verify=False,
+                    timeout=10
+                )
+                return f"Request {i+1}: {response.status_code}"
+            except Exception as e:
+                return f"Request {i+1} failed: {e}"
+
+        return await asyncio.gather(*(fetch(i) for i in range(count)))
+
+
+def make_requests_concurrent(count: int = 10):
+    """Send all requests at once - load testing, no human-like delays."""
+
+    print("=" * 60)
+    print("Level 1: curl_cffi Chrome Impersonation (concurrent)")
+    print("=" * 60)
+    print()
+    print("Same Chrome TLS fingerprint, but every request is in flight at once.")
+    print()
+
+    for line in asyncio.run(fetch_all(count)):
+        print(line)
+
+
 def test_detection():
     """Test if the detection API catches this client."""
 
+    # Slightly more realistic timing: 0.5-2s between consecutive requests
+    gaps = (random.uniform(0.5, 2.0) for _ in range(9))
+    request_times = list(accumulate(gaps, initial=time.time()))
+
     # curl_cffi should produce Chrome-like JA4
     test_data = {
         "ja4": "t13d1516h2_8daaf6152771_e5627efa2ab1",  # Chrome-like
         "user_agent": CHROME_UA,
         "session_data": {
-            # Slightly more realistic timing
-            "request_times": [
-                time.time() + sum(random.uniform(0.5, 2.0) for _ in range(i))
-                for i in range(10)
-            ],
+            "request_times": request_times,
             "request_paths": ["/", "/about", "/products", "/contact"] * 3
         }
     }
@@ -89,8 +148,7 @@ def test_detection():
     print(f"JA4: {test_data['ja4']}")
 
     try:
-        import requests
-        response = requests.post(
+        response = detection_session().post(
             f"{DETECTION_API}/test-evasion",
             json=test_data
         )
@@ -114,7 +172,10 @@ if __name__ == "__main__":
 
     if "--test-detection" in sys.argv:
         test_detection()
+    elif "--concurrent" in sys.argv:
+        make_requests_concurrent()
     else:
         make_requests()
         print()
         print("Run with --test-detection to test against detection API")
+        print("Run with --concurrent to send the requests all at once")
@@ -11,15 +11,11 @@ Detection hints for students:
 - Cross-layer correlation (JA4 vs OS in UA vs TCP TTL)
 """
 
-try:
-    from tls_client import Session
-except ImportError:
-    print("tls_client not installed. Install with: pip install tls-client")
-    exit(1)
-
+import io
 import time
 import random
 import json
+from itertools import accumulate
 
 TARGET_URL = "https://localhost:8443"
 DETECTION_API = "http://localhost:5000"
@@ -30,6 +26,20 @@ CHROME_UA = (
     "Chrome/120.0.0.0 Safari/537.36"
 )
 
+
+# test_detection() reuses one connection to the local API
+_detection_session = None
+
+
+def detection_session():
+    """Get the requests session for the detection API (opened on first use)."""
+    global _detection_session
+    if _detection_session is None:
+        import requests
+        _detection_session = requests.Session()
+    return _detection_session
+
+
 # Chrome's HTTP/2 SETTINGS (Akamai fingerprint style)
 CHROME_H2_SETTINGS = {
     "HEADER_TABLE_SIZE": 65536,
@@ -44,6 +54,14 @@ CHROME_H2_SETTINGS = {
 def create_session():
     """Create tls_client session with Chrome configuration."""
 
+    # Imported here rather than at module load - tls_client loads a native
+    # library, and test_detection() doesn't need it
+    try:
+        from tls_client import Session
+    except ImportError:
+        print("tls_client not installed. Install with: pip install tls-client")
+        exit(1)
+
     return Session(
         client_identifier="chrome_120",
         random_tls_extension_order=True,  # Chrome randomizes since v110
@@ -138,21 +156,45 @@ def make_requests(count: int = 10):
             print(f"Request {i+1} failed: {e}")
 
 
+class _PreviewFull(Exception):
+    pass
+
+
+class _PreviewBuffer(io.StringIO):
+    """StringIO that stops the writer once it holds `limit` characters."""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def write(self, text):
+        super().write(text)
+        if self.tell() >= self.limit:
+            raise _PreviewFull
+
+
+def json_preview(data, limit: int = 200) -> str:
+    """First `limit` characters of json.dumps(data, indent=4), without encoding the rest."""
+    buf = _PreviewBuffer(limit)
+    try:
+        # json.dump writes chunk by chunk, so this stops encoding early
+        json.dump(data, buf, indent=4)
+    except _PreviewFull:
+        pass
+    return buf.getvalue()[:limit]
+
+
 def test_detection():
     """Test detection API."""
 
     # Simulate a realistic browsing session
     base_time = time.time()
-    delays = []
-    current = 0
-
-    for _ in range(15):
-        if random.random() < 0.2:
-            delay = random.uniform(3.0, 8.0)  # Reading time
-        else:
-            delay = random.uniform(0.5, 2.5)
-        current += delay
-        delays.append(base_time + current)
+    gaps = (
+        random.uniform(3.0, 8.0) if random.random() < 0.2  # Reading time
+        else random.uniform(0.5, 2.5)
+        for _ in range(15)
+    )
+    delays = list(accumulate(gaps, initial=base_time))[1:]
 
     test_data = {
         "ja4": "t13d1516h2_8daaf6152771_e5627efa2ab1",
@@ -175,8 +217,7 @@ def test_detection():
     print(f"Request count: {len(delays)}")
 
     try:
-        import requests
-        response = requests.post(
+        response = detection_session().post(
             f"{DETECTION_API}/test-evasion",
             json=test_data
         )
@@ -194,7 +235,7 @@ def test_detection():
         print()
         print("Signals analyzed:")
         for signal, data in result.get('signals', {}).items():
-            print(f"  {signal}: {json.dumps(data, indent=4)[:200]}")
+            print(f"  {signal}: {json_preview(data)}")
 
     except Exception as e:
         print(f"Detection API error: {e}")